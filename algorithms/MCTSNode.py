@@ -1,10 +1,17 @@
-from typing import List, Optional
+from typing import List, Optional, Callable
 import random
 import math
+from utils import find_all_arithmetic_progressions, ProgressionTracker
+from algorithms.symmetry import representative_moves, collapse_dead_moves
+from algorithms.endgame import EndgameTable, table_for
 
 
 class MCTSNode:
-    def __init__(self, available: List[int], current: List[int], opponent: List[int], is_player_turn: bool, k: int):
+    def __init__(self, available: List[int], current: List[int], opponent: List[int], is_player_turn: bool, k: int,
+                 tracker: Optional[ProgressionTracker] = None, symmetry_depth: int = -1, depth: int = 0,
+                 endgame_cells: int = 0, endgame: Optional[EndgameTable] = None,
+                 widening: float = 0.0, widening_exponent: float = 0.5, prior: Optional[Callable] = None,
+                 rollout_cells: int = 0):
         self.available = available
         self.current = current
         self.opponent = opponent
@@ -13,9 +20,46 @@ class MCTSNode:
         self.visits = 0
         self.wins = 0
         self.children: List[MCTSNode] = []
-        self.untried_moves = available[:]
         self.parent: Optional[MCTSNode] = None
         self.move = None  # The move that led to this node
+        if tracker is None:
+            # Player 0 is the root's current player, player 1 its opponent
+            progressions = find_all_arithmetic_progressions(k, available + current + opponent)
+            tracker = ProgressionTracker(progressions, current, opponent)
+        self.tracker = tracker
+        # Nodes with at most endgame_cells empty numbers are leaves valued exactly
+        # by the endgame table instead of random rollouts (0 disables this)
+        self.endgame_cells = endgame_cells
+        if endgame_cells > 0 and endgame is None:
+            endgame = table_for(k, tracker.progressions, available + current + opponent)
+        self.endgame = endgame
+        # Rollouts stop at rollout_cells empty numbers and return the exact value
+        # (at most endgame_cells, whose table they share; 0 plays them out)
+        self.rollout_cells = min(rollout_cells, endgame_cells)
+        # Nodes up to symmetry_depth expand one move per class of equivalent moves,
+        # deeper nodes only merge the moves outside every live AP (-1 disables both)
+        self.symmetry_depth = symmetry_depth
+        self.depth = depth
+        if symmetry_depth < 0 or self.is_terminal():
+            self.untried_moves = available[:]
+        elif depth <= symmetry_depth:
+            self.untried_moves = representative_moves(tracker, available)
+        else:
+            self.untried_moves = collapse_dead_moves(tracker, available)
+        # Progressive widening: a node may have at most widening * visits^widening_exponent
+        # children and expands the moves with the highest prior first (0 disables it).
+        # prior(tracker, moves, player) scores moves, the AP-threat prior by default.
+        self.widening = widening
+        self.widening_exponent = widening_exponent
+        self.prior = prior
+        if widening > 0 and self.untried_moves:
+            player = 0 if is_player_turn else 1
+            if prior is None:
+                scores = [tracker.threat(move, player) for move in self.untried_moves]
+            else:
+                scores = prior(tracker, self.untried_moves, player)
+            order = sorted(range(len(scores)), key=lambda i: scores[i])
+            self.untried_moves = [self.untried_moves[i] for i in order]
 
     def expand(self):
         move = self.untried_moves.pop()
@@ -29,12 +73,24 @@ class MCTSNode:
         else:
             next_opponent.append(move)
 
+        next_tracker = self.tracker.copy()
+        next_tracker.place(move, 0 if self.is_player_turn else 1)
+
         child = MCTSNode(
             next_available,
             next_current if self.is_player_turn else self.current,
             next_opponent if not self.is_player_turn else self.opponent,
             not self.is_player_turn,
-            self.k
+            self.k,
+            next_tracker,
+            symmetry_depth=self.symmetry_depth,
+            depth=self.depth + 1,
+            endgame_cells=self.endgame_cells,
+            endgame=self.endgame,
+            widening=self.widening,
+            widening_exponent=self.widening_exponent,
+            prior=self.prior,
+            rollout_cells=self.rollout_cells
         )
         child.parent = self
         child.move = move
@@ -42,7 +98,9 @@ class MCTSNode:
         return child
 
     def is_fully_expanded(self):
-        return len(self.untried_moves) == 0
+        if len(self.untried_moves) == 0:
+            return True
+        return self.widening > 0 and len(self.children) >= self.widening * max(1, self.visits) ** self.widening_exponent
 
     def best_child(self, c_param=1.4):
         return max(self.children, key=lambda child: child.wins / child.visits + c_param * math.sqrt(math.log(self.visits) / child.visits))
@@ -51,48 +109,48 @@ class MCTSNode:
         return random.choice(available)
 
     def is_terminal(self):
-        return len(self.available) == 0 or self.has_ap(self.current, self.k) or self.has_ap(self.opponent, self.k)
-
-    def has_ap(self, seq: List[int], k: int) -> bool:
-        s = set(seq)
-        n = len(s)
-        if n < k:
-            return False
-        sorted_seq = sorted(s)
-        for i in range(n):
-            for j in range(i + 1, n):
-                d = sorted_seq[j] - sorted_seq[i]
-                count = 2
-                next_val = sorted_seq[j] + d
-                while next_val in s:
-                    count += 1
-                    if count == k:
-                        return True
-                    next_val += d
-        return False
+        return len(self.available) == 0 or self.tracker.winner is not None or self.tracker.is_draw() or self.is_solved()
+
+    def is_solved(self):
+        return len(self.available) <= self.endgame_cells
+
+    def outcome(self, tracker: ProgressionTracker) -> float:
+        if tracker.winner is None:
+            return 0.5  # draw
+        return 1 if tracker.winner == 0 else 0
+
+    def solved_value(self) -> float:
+        return self._endgame_value(self.endgame.mask(self.current), self.endgame.mask(self.opponent), self.is_player_turn)
+
+    def _endgame_value(self, held0: int, held1: int, turn: bool) -> float:
+        """Exact value for player 0 of the position with bitmasks `held0` and `held1`, `turn` if player 0 moves."""
+        value = self.endgame.solve(held0, held1) if turn else -self.endgame.solve(held1, held0)
+        return (value + 1) / 2
 
     def rollout(self):
-        current = self.current[:]
-        opponent = self.opponent[:]
+        if self.tracker.winner is None and not self.tracker.is_draw() and self.available and self.is_solved():
+            return self.solved_value()
+        tracker = self.tracker.copy()
         available = self.available[:]
         turn = self.is_player_turn
+        if self.rollout_cells > 0:
+            # Bitmasks of both players' numbers, so the rollout can hand over to the endgame table
+            held = [self.endgame.mask(self.current), self.endgame.mask(self.opponent)]
 
-        while available:
+        while available and tracker.winner is None and not tracker.is_draw():
+            if len(available) <= self.rollout_cells:
+                return self._endgame_value(held[0], held[1], turn)
             move = self.rollout_policy(available)
             available.remove(move)
-            if turn:
-                current.append(move)
-                if self.has_ap(current, self.k):
-                    return 1  # win
-            else:
-                opponent.append(move)
-                if self.has_ap(opponent, self.k):
-                    return 0  # loss
+            player = 0 if turn else 1
+            tracker.place(move, player)
+            if self.rollout_cells > 0:
+                held[player] |= self.endgame.bits[move]
             turn = not turn
-        return 0.5  # draw
+        return self.outcome(tracker)
 
     def backpropagate(self, result):
         self.visits += 1
         self.wins += result
         if self.parent:
-            self.parent.backpropagate(result)
\ No newline at end of file
+            self.parent.backpropagate(result)
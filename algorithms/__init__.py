@@ -1,8 +1,113 @@
-registry = {}
+import os
+import sys
+import importlib
+from collections.abc import Mapping
+
+# Extra directories with algorithm modules, separated by os.pathsep
+PLUGIN_PATH_ENV = "SZEMEREDI_ALGORITHM_PATH"
+
+
+def scan_algorithm_names(path: str) -> list[str]:
+    """
+    Lists the names registered with `@register_algorithm("name")` in a source
+    file without importing it. Only decorators written on a single line with a
+    string literal name are recognised.
+    """
+    names = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line.startswith("@") or "register_algorithm(" not in line or not line.endswith(")"):
+                continue
+            arg = line[line.index("(") + 1:-1].strip()
+            if len(arg) >= 2 and arg[0] in "'\"" and arg[-1] == arg[0]:
+                names.append(arg[1:-1].lower())
+    return names
+
+
+class AlgorithmRegistry(Mapping):
+    """
+    Maps algorithm names to move functions, importing each module only on first use.
+
+    Names come from scanning the modules of this package and of the plugin
+    directories for `@register_algorithm` decorators, so listing them imports
+    no algorithm code.
+    """
+    def __init__(self):
+        self._functions: dict = {}
+        self._modules: dict[str, tuple[str, str]] = {}  # name -> (module name, file path)
+        self._discovered: bool = False
+
+    def register(self, name: str, func) -> None:
+        self._functions[name.lower()] = func
+
+    def plugin_dirs(self) -> list[str]:
+        dirs = [os.path.dirname(os.path.abspath(__file__))]
+        dirs += [d for d in os.environ.get(PLUGIN_PATH_ENV, "").split(os.pathsep) if d]
+        return dirs
+
+    def discover(self) -> None:
+        if self._discovered:
+            return
+        self._discovered = True
+        for i, directory in enumerate(self.plugin_dirs()):
+            if not os.path.isdir(directory):
+                continue
+            for filename in sorted(os.listdir(directory)):
+                stem, ext = os.path.splitext(filename)
+                if ext != ".py" or stem == "__init__":
+                    continue
+                path = os.path.join(directory, filename)
+                # Plugin modules are named after their directory too, so equal file names do not collide
+                module_name = f"{__name__}.{stem}" if i == 0 else f"{__name__}._plugins.dir{i}_{stem}"
+                for name in scan_algorithm_names(path):
+                    self._modules.setdefault(name, (module_name, path))
+
+    def load_module(self, module_name: str, path: str) -> None:
+        if module_name.startswith(f"{__name__}._plugins."):
+            if module_name in sys.modules:
+                return
+            from importlib.util import spec_from_file_location, module_from_spec
+            spec = spec_from_file_location(module_name, path)
+            module = module_from_spec(spec)
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
+        else:
+            importlib.import_module(module_name)
+
+    def __getitem__(self, name: str):
+        name = name.lower()
+        if name not in self._functions:
+            self.discover()
+            if name not in self._modules:
+                raise KeyError(name)
+            module_name, path = self._modules[name]
+            self.load_module(module_name, path)
+            if name not in self._functions:
+                raise ImportError(f"{path} was expected to register algorithm {name!r} but did not")
+        return self._functions[name]
+
+    def __iter__(self):
+        self.discover()
+        return iter(dict.fromkeys([*self._modules, *self._functions]))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, name) -> bool:
+        if not isinstance(name, str):
+            return False
+        self.discover()
+        name = name.lower()
+        return name in self._modules or name in self._functions
+
+    def is_loaded(self, name: str) -> bool:
+        return name.lower() in self._functions
+
+
+registry = AlgorithmRegistry()
 def register_algorithm(name):
     def decorator(func):
-        registry[name.lower()] = func
+        registry.register(name, func)
         return func
     return decorator
-
-from . import algorithms
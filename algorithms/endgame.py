@@ -0,0 +1,123 @@
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+# Positions with at most this many empty numbers are solved exactly
+ENDGAME_CELLS: int = 10
+# Number of boards whose tables are kept in memory
+MAX_TABLES: int = 8
+# Solved positions kept per board before its table is cleared. Solving one
+# ENDGAME_CELLS position visits at most 3^ENDGAME_CELLS = 59049 positions.
+MAX_ENTRIES: int = 100000
+
+
+class EndgameTable:
+    """
+    Exact solver for the positions of one board.
+
+    Positions are pairs of bitmasks (numbers held by the player to move,
+    numbers held by the other player) and every solved position is memoized,
+    so the table fills up as searches reach the end of the game. Values are
+    from the point of view of the player to move: 1 win, 0 draw, -1 loss.
+    """
+    def __init__(self, progressions: List[List[int]], numbers: List[int], max_entries: int = MAX_ENTRIES):
+        self.numbers = sorted(numbers)
+        self.bits: Dict[int, int] = {v: 1 << i for i, v in enumerate(self.numbers)}
+        self.full = (1 << len(self.numbers)) - 1
+        self.masks: List[int] = [sum(self.bits[v] for v in prog) for prog in progressions]
+        self.masks_with: Dict[int, List[int]] = {bit: [] for bit in self.bits.values()}
+        for mask in self.masks:
+            for v in self.numbers:
+                if mask & self.bits[v]:
+                    self.masks_with[self.bits[v]].append(mask)
+        self.table: Dict[Tuple[int, int], int] = {}
+        self.max_entries = max_entries
+
+    def mask(self, values: List[int]) -> int:
+        result = 0
+        for v in values:
+            result |= self.bits[v]
+        return result
+
+    def completes(self, held: int, bit: int) -> bool:
+        held |= bit
+        return any(mask & held == mask for mask in self.masks_with[bit])
+
+    def candidate_moves(self, mover: int, other: int) -> List[int]:
+        """
+        Empty numbers worth trying: every number in a live AP and a single one
+        of the numbers outside all live APs (those are interchangeable).
+        """
+        live = 0
+        for mask in self.masks:
+            if not (mask & mover and mask & other):
+                live |= mask
+        empty = self.full & ~(mover | other)
+        moves = []
+        dead = empty & ~live
+        if dead:
+            moves.append(dead & -dead)
+        remaining = empty & live
+        while remaining:
+            bit = remaining & -remaining
+            moves.append(bit)
+            remaining ^= bit
+        return moves
+
+    def solve(self, mover: int, other: int) -> int:
+        key = (mover, other)
+        value = self.table.get(key)
+        if value is not None:
+            return value
+        if not any(mask & other == 0 or mask & mover == 0 for mask in self.masks):
+            self._store(key, 0)  # Neither player can complete an AP anymore
+            return 0
+        moves = self.candidate_moves(mover, other)
+        if not moves:
+            value = 0
+        elif any(self.completes(mover, bit) for bit in moves):
+            value = 1
+        else:
+            value = -1
+            for bit in moves:
+                value = max(value, -self.solve(other, mover | bit))
+                if value == 1:
+                    break
+        self._store(key, value)
+        return value
+
+    def _store(self, key: Tuple[int, int], value: int) -> None:
+        # Rollouts keep adding fresh positions, so the table starts over when full
+        if len(self.table) >= self.max_entries:
+            self.table.clear()
+        self.table[key] = value
+
+    def best_move(self, available: List[int], current: List[int], opponent: List[int]) -> Tuple[int, int]:
+        """
+        Returns:
+            The best move for the player holding `current` and its value
+        """
+        mover, other = self.mask(current), self.mask(opponent)
+        best_value, best_move = -2, available[0]
+        for move in available:
+            bit = self.bits[move]
+            value = 1 if self.completes(mover, bit) else -self.solve(other, mover | bit)
+            if value > best_value:
+                best_value, best_move = value, move
+                if value == 1:
+                    break
+        return best_move, best_value
+
+
+_tables: "OrderedDict[Tuple[int, Tuple[int, ...]], EndgameTable]" = OrderedDict()
+
+def table_for(k: int, progressions: List[List[int]], numbers: List[int]) -> EndgameTable:
+    """Returns the shared table of a board, so results are reused across moves and searches."""
+    key = (k, tuple(sorted(numbers)))
+    table = _tables.get(key)
+    if table is None:
+        table = _tables[key] = EndgameTable(progressions, numbers)
+        if len(_tables) > MAX_TABLES:
+            _tables.popitem(last=False)
+    else:
+        _tables.move_to_end(key)
+    return table
@@ -0,0 +1,86 @@
+from typing import List, Callable, Optional
+from . import register_algorithm
+from algorithms.MCTSNode import MCTSNode
+from algorithms.endgame import ENDGAME_CELLS, table_for
+from utils import find_all_arithmetic_progressions
+
+# Depth up to which equivalent moves are merged by the automorphism search,
+# deeper nodes only merge dead moves (the search costs more than it saves there)
+SYMMETRY_DEPTH = 0
+# Progressive widening: a node visited n times may have WIDENING * n^WIDENING_EXPONENT children
+WIDENING = 1.0
+WIDENING_EXPONENT = 0.5
+SIMULATIONS = 1000
+# Rollouts reaching this many empty numbers take the endgame table's value. Solving
+# fresh positions in every rollout is costly: ~1.8x the search time at 6, ~30x at 10.
+ROLLOUT_CELLS = 6
+
+def compare(a: List[int], b: List[int]) -> bool:
+    if len(a) != len(b):
+        return False
+    for i in range(len(a)):
+        if a[i] != b[i]:
+            return False
+    return True
+
+def solve_endgame(available_moves: List[int], current_held: List[int], opponent_held: List[int], k: int) -> int:
+    numbers = available_moves + current_held + opponent_held
+    table = table_for(k, find_all_arithmetic_progressions(k, numbers), numbers)
+    return table.best_move(available_moves, current_held, opponent_held)[0]
+
+def make_root(available_moves: List[int], current_held: List[int], opponent_held: List[int], k: int,
+              prior: Optional[Callable] = None) -> MCTSNode:
+    return MCTSNode(available_moves, current_held, opponent_held, True, k, symmetry_depth=SYMMETRY_DEPTH,
+                    endgame_cells=ENDGAME_CELLS, widening=WIDENING, widening_exponent=WIDENING_EXPONENT,
+                    prior=prior, rollout_cells=ROLLOUT_CELLS)
+
+def search(root: MCTSNode, simulations: int = SIMULATIONS) -> MCTSNode:
+    for _ in range(simulations):
+        node = root
+
+        # Selection
+        while not node.is_terminal() and node.is_fully_expanded():
+            node = node.best_child()
+
+        # Expansion
+        if not node.is_terminal() and not node.is_fully_expanded():
+            node = node.expand()
+
+        # Simulation
+        result = node.rollout()
+
+        # Backpropagation
+        node.backpropagate(result)
+    return root
+
+prev_root = None
+@register_algorithm("mcts_cached")
+def choose_move(available_moves: List[int], current_held: List[int], opponent_held: List[int], k: int) -> int:
+    if len(available_moves) <= ENDGAME_CELLS:
+        return solve_endgame(available_moves, current_held, opponent_held, k)
+    root = None
+    global prev_root
+    if prev_root is not None:
+        for child in prev_root.children:
+            if compare(child.current, current_held) and compare(child.opponent, opponent_held):
+                root = child
+                root.parent = None
+                break
+    if not root:
+        root = make_root(available_moves, current_held, opponent_held, k)
+    search(root)
+
+    # Choose the move with the most visits
+    best_child = max(root.children, key=lambda c: c.visits)
+    prev_root = best_child
+    return best_child.move
+
+@register_algorithm("mcts")
+def choose_move(available_moves: List[int], current_held: List[int], opponent_held: List[int], k: int) -> int:
+    if len(available_moves) <= ENDGAME_CELLS:
+        return solve_endgame(available_moves, current_held, opponent_held, k)
+    root = search(make_root(available_moves, current_held, opponent_held, k))
+
+    # Choose the move with the most visits
+    best_child = max(root.children, key=lambda c: c.visits)
+    return best_child.move
@@ -0,0 +1,119 @@
+import itertools
+import os
+from functools import lru_cache
+from typing import List, Optional
+
+import numpy as np
+
+from . import register_algorithm
+from utils import find_all_arithmetic_progressions, ProgressionTracker
+
+WEIGHTS_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "policy_weights.npz")
+
+# Per-number features: a bias, then the APs through the number that the player to
+# move can still complete and that the opponent can still complete (and so may
+# need blocking), bucketed by how many numbers would still be missing afterwards.
+MISSING_BUCKETS: int = 4
+NUM_FEATURES: int = 1 + 2 * MISSING_BUCKETS
+
+
+def move_features(tracker: ProgressionTracker, moves: List[int], player: int) -> np.ndarray:
+    """
+    Returns:
+        Array of shape (len(moves), NUM_FEATURES) with the AP-threat counts of every move
+    """
+    rows = len(moves)
+    entries = [tracker.index.get(move, ()) for move in moves]
+    counts = [len(aps) for aps in entries]
+    total = sum(counts)
+    features = np.zeros((rows, NUM_FEATURES), dtype=np.float32)
+    features[:, 0] = 1.0
+    if total == 0:
+        return features
+    # One (row, AP) pair per AP through every move, bucketed in bulk instead of
+    # counting into the array one item at a time
+    aps = np.fromiter(itertools.chain.from_iterable(entries), dtype=np.int64, count=total)
+    row = np.repeat(np.arange(rows), counts)
+    own = np.asarray(tracker.held[player])[aps]
+    other = np.asarray(tracker.held[1 - player])[aps]
+    size = len(tracker.progressions[0])  # All APs of a board have k terms
+    own_open, other_open = other == 0, own == 0
+    columns = [1 + np.minimum(size - own - 1, MISSING_BUCKETS - 1)[own_open],
+               1 + MISSING_BUCKETS + np.minimum(size - other - 1, MISSING_BUCKETS - 1)[other_open]]
+    cells = np.concatenate([row[own_open] * NUM_FEATURES + columns[0], row[other_open] * NUM_FEATURES + columns[1]])
+    features += np.bincount(cells, minlength=rows * NUM_FEATURES).reshape(rows, NUM_FEATURES).astype(np.float32)
+    return features
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    exp = np.exp(logits - logits.max())
+    return exp / exp.sum()
+
+
+class PolicyModel:
+    """
+    Linear policy/value model over move features.
+
+    The policy is a softmax over the available numbers of `features @ policy`.
+    The value, from the point of view of the player to move, is
+    `tanh(mean(features) @ value + bias)`.
+    """
+    def __init__(self, policy: Optional[np.ndarray] = None, value: Optional[np.ndarray] = None, bias: float = 0.0):
+        if policy is None:
+            # Untrained defaults: win now, else block, else extend the most advanced APs
+            policy = np.array([0.0, 20.0, 2.0, 0.5, 0.1, 10.0, 1.5, 0.3, 0.05], dtype=np.float32)
+        self.policy = np.asarray(policy, dtype=np.float32)
+        self.value = np.zeros(NUM_FEATURES, dtype=np.float32) if value is None else np.asarray(value, dtype=np.float32)
+        self.bias = float(bias)
+
+    def logits(self, features: np.ndarray) -> np.ndarray:
+        return features @ self.policy
+
+    def predict_value(self, features: np.ndarray) -> float:
+        return float(np.tanh(features.mean(axis=0) @ self.value + self.bias))
+
+    def save(self, path: str) -> None:
+        np.savez(path, policy=self.policy, value=self.value, bias=np.float32(self.bias))
+
+    @classmethod
+    def load(cls, path: str) -> "PolicyModel":
+        with np.load(path) as data:
+            return cls(data["policy"], data["value"], float(data["bias"]))
+
+
+_model: Optional[PolicyModel] = None
+
+def get_model() -> PolicyModel:
+    """Returns the model trained into WEIGHTS_PATH, or the untrained defaults if there is none."""
+    global _model
+    if _model is None:
+        _model = PolicyModel.load(WEIGHTS_PATH) if os.path.exists(WEIGHTS_PATH) else PolicyModel()
+    return _model
+
+def set_model(model: PolicyModel) -> None:
+    global _model
+    _model = model
+
+@lru_cache(maxsize=8)
+def board_progressions(k: int, numbers: tuple) -> List[List[int]]:
+    return find_all_arithmetic_progressions(k, list(numbers))
+
+def policy_prior(tracker: ProgressionTracker, moves: List[int], player: int) -> List[float]:
+    """Move prior for MCTSNode: the policy logits of the moves."""
+    return get_model().logits(move_features(tracker, moves, player)).tolist()
+
+@register_algorithm("policy")
+def choose_move(available_moves: List[int], current_held: List[int], opponent_held: List[int], k: int) -> int:
+    if not available_moves:
+        return -1
+    numbers = tuple(sorted(available_moves + current_held + opponent_held))
+    tracker = ProgressionTracker(board_progressions(k, numbers), current_held, opponent_held)
+    logits = get_model().logits(move_features(tracker, available_moves, 0))
+    return available_moves[int(np.argmax(logits))]
+
+@register_algorithm("mcts_policy")
+def choose_move(available_moves: List[int], current_held: List[int], opponent_held: List[int], k: int) -> int:
+    from algorithms import mcts
+    if len(available_moves) <= mcts.ENDGAME_CELLS:
+        return mcts.solve_endgame(available_moves, current_held, opponent_held, k)
+    root = mcts.search(mcts.make_root(available_moves, current_held, opponent_held, k, prior=policy_prior))
+    return max(root.children, key=lambda c: c.visits).move
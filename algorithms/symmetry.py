@@ -0,0 +1,143 @@
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from utils import ProgressionTracker
+
+# Upper bound on branching steps spent looking for a single automorphism
+SEARCH_BUDGET: int = 64
+
+Edge = Tuple[frozenset, int]
+
+
+def position_hypergraph(tracker: ProgressionTracker, available: List[int]) -> List[Edge]:
+    """
+    Reduces a position to the APs that can still be completed.
+
+    Each AP becomes an edge on the available numbers labelled with the player
+    already holding part of it (0 or 1) or 2 if it is untouched. The rest of
+    the game only depends on this labelled hypergraph.
+    """
+    available_set = set(available)
+    edges = []
+    for i, prog in enumerate(tracker.progressions):
+        first, second = tracker.held[0][i], tracker.held[1][i]
+        if first and second:
+            continue
+        label = 0 if first else 1 if second else 2
+        edges.append((frozenset(v for v in prog if v in available_set), label))
+    return edges
+
+def _refine(vertices: List[int], edges: List[Edge], incidence: Dict[int, List[int]],
+            colors: Dict[int, int]) -> Dict[int, int]:
+    """
+    Colour refinement: splits colour classes by the colours seen through the
+    edges of each vertex until the partition is stable. Colours are numbered
+    from the sorted signatures, so isomorphic inputs get matching colours.
+    """
+    classes = len(set(colors.values()))
+    while True:
+        signatures = {}
+        for v in vertices:
+            around = sorted((edges[e][1], tuple(sorted(colors[u] for u in edges[e][0] if u != v))) for e in incidence[v])
+            signatures[v] = (colors[v], tuple(around))
+        ids = {sig: i for i, sig in enumerate(sorted(set(signatures.values())))}
+        colors = {v: ids[signatures[v]] for v in vertices}
+        if len(ids) == classes:
+            return colors
+        classes = len(ids)
+
+def _cells(colors: Dict[int, int]) -> Dict[int, List[int]]:
+    cells: Dict[int, List[int]] = {}
+    for v in sorted(colors):
+        cells.setdefault(colors[v], []).append(v)
+    return cells
+
+def _find_automorphism(vertices: List[int], edges: List[Edge], incidence: Dict[int, List[int]],
+                       edge_counts: Counter, colors_a: Dict[int, int], colors_b: Dict[int, int],
+                       budget: List[int]) -> Optional[Dict[int, int]]:
+    colors_a = _refine(vertices, edges, incidence, colors_a)
+    colors_b = _refine(vertices, edges, incidence, colors_b)
+    cells_a, cells_b = _cells(colors_a), _cells(colors_b)
+    if {c: len(cell) for c, cell in cells_a.items()} != {c: len(cell) for c, cell in cells_b.items()}:
+        return None
+    split = next((c for c in sorted(cells_a) if len(cells_a[c]) > 1), None)
+    if split is None:
+        perm = {cells_a[c][0]: cells_b[c][0] for c in cells_a}
+        mapped = Counter((frozenset(perm[v] for v in members), label) for members, label in edges)
+        return perm if mapped == edge_counts else None
+    va = cells_a[split][0]
+    for vb in cells_b[split]:
+        if budget[0] <= 0:
+            return None
+        budget[0] -= 1
+        perm = _find_automorphism(vertices, edges, incidence, edge_counts,
+                                  {**colors_a, va: -1}, {**colors_b, vb: -1}, budget)
+        if perm:
+            return perm
+    return None
+
+def equivalence_classes(tracker: ProgressionTracker, available: List[int]) -> List[List[int]]:
+    """
+    Groups the available numbers into classes of equivalent moves.
+
+    Two numbers are equivalent if an automorphism of the position hypergraph
+    maps one onto the other, so playing either leads to the same game. The
+    search for automorphisms is bounded, numbers it cannot prove equivalent
+    stay in separate classes.
+
+    Returns:
+        Classes of equivalent numbers, each sorted, the smallest number first
+    """
+    edges = position_hypergraph(tracker, available)
+    incidence: Dict[int, List[int]] = {v: [] for v in available}
+    for e, (members, _) in enumerate(edges):
+        for v in members:
+            incidence[v].append(e)
+    # Numbers outside every edge are trivially interchangeable, the search
+    # only runs on the rest
+    isolated = sorted(v for v in available if not incidence[v])
+    vertices = sorted(v for v in available if incidence[v])
+    colors = _refine(vertices, edges, incidence, {v: 0 for v in vertices})
+
+    parent = {v: v for v in vertices}
+    def find(v: int) -> int:
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    edge_counts = Counter(edges)
+    for cell in _cells(colors).values():
+        rep = cell[0]
+        for w in cell[1:]:
+            if find(w) == find(rep):
+                continue
+            perm = _find_automorphism(vertices, edges, incidence, edge_counts,
+                                      {**colors, rep: -1}, {**colors, w: -1}, [SEARCH_BUDGET])
+            if perm is None:
+                continue
+            for v, u in perm.items():
+                parent[find(u)] = find(v)
+
+    classes: Dict[int, List[int]] = {}
+    for v in vertices:
+        classes.setdefault(find(v), []).append(v)
+    return sorted(list(classes.values()) + ([isolated] if isolated else []))
+
+def representative_moves(tracker: ProgressionTracker, available: List[int]) -> List[int]:
+    """Returns one number (the smallest) from every class of equivalent moves."""
+    return [cls[0] for cls in equivalence_classes(tracker, available)]
+
+def collapse_dead_moves(tracker: ProgressionTracker, available: List[int]) -> List[int]:
+    """
+    Cheap partial pruning: numbers outside every AP that can still be completed
+    are all equivalent, keeps only the smallest of them.
+    """
+    live_numbers = set()
+    for prog, first, second in zip(tracker.progressions, *tracker.held):
+        if not (first and second):
+            live_numbers.update(prog)
+    live = [v for v in available if v in live_numbers]
+    if len(live) + 1 >= len(available):
+        return live if len(live) == len(available) else available[:]
+    return live + [min(v for v in available if v not in live_numbers)]
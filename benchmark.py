@@ -1,11 +1,15 @@
+import argparse
 import itertools
+import json
+import math
+import os
 from collections import defaultdict
 import time
-from typing import Dict, List, Any, Tuple, Set
+from typing import Dict, List, Any, Optional, Tuple, Set
 import random
 
 from algorithms import registry
-from game import Game
+from engine import Game
 
 def play_game(game: Game, algo1: str, algo2: str) -> tuple[int, float, float]:
     """
@@ -46,13 +50,181 @@ def play_game(game: Game, algo1: str, algo2: str) -> tuple[int, float, float]:
 
     return game.winner if game.winner else 0, algo1_time, algo2_time
 
-def run_tournament(settings: Dict[str, Any], num_games: int = 10) -> Dict:
+class TimeSketch:
+    """
+    Streaming quantiles of non-negative times in log-spaced buckets.
+
+    Every quantile is within `accuracy` relative error of the true value, and
+    the number of buckets only grows with the log of the time range, not
+    with the number of samples.
+    """
+    def __init__(self, accuracy: float = 0.02):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = defaultdict(int)
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        if value <= 1e-9:
+            self.zeros += 1
+        else:
+            self.buckets[math.ceil(math.log(value) / self.log_gamma)] += 1
+
+    def quantile(self, q: float) -> float:
+        if self.count == 0:
+            return 0.0
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if rank < seen:
+                return 2 * self.gamma ** bucket / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class TournamentStats:
+    """Running tournament aggregates, constant in size with respect to the number of games."""
+    def __init__(self):
+        self.wins: Dict[str, int] = defaultdict(int)
+        self.draws: Dict[str, int] = defaultdict(int)
+        self.losses: Dict[str, int] = defaultdict(int)
+        self.points: Dict[str, float] = defaultdict(float)  # 1 for win, 0.5 for draw
+        self.matchups = defaultdict(lambda: defaultdict(lambda: {"wins": 0, "draws": 0, "losses": 0}))
+        self.total_games = 0
+        self.execution_time: Dict[str, float] = defaultdict(float)
+        self.game_times: Dict[str, TimeSketch] = defaultdict(TimeSketch)
+        self.played: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def record(self, algo1: str, algo2: str, winner: int, algo1_time: float, algo2_time: float) -> None:
+        if winner == 1:
+            self._result(algo1, algo2, "wins", "losses", 1.0)
+        elif winner == 2:
+            self._result(algo1, algo2, "losses", "wins", 0.0)
+        else:
+            self._result(algo1, algo2, "draws", "draws", 0.5)
+        self.execution_time[algo1] += algo1_time
+        self.execution_time[algo2] += algo2_time
+        self.game_times[algo1].add(algo1_time)
+        self.game_times[algo2].add(algo2_time)
+        self.played[(algo1, algo2)] += 1
+        self.total_games += 1
+
+    def _result(self, algo1: str, algo2: str, result1: str, result2: str, points1: float) -> None:
+        getattr(self, result1)[algo1] += 1
+        getattr(self, result2)[algo2] += 1
+        self.points[algo1] += points1
+        self.points[algo2] += 1.0 - points1
+        self.matchups[algo1][algo2][result1] += 1
+        self.matchups[algo2][algo1][result2] += 1
+
+    def games(self, algo: str) -> int:
+        return self.wins[algo] + self.draws[algo] + self.losses[algo]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wins": self.wins,
+            "draws": self.draws,
+            "losses": self.losses,
+            "points": self.points,
+            "matchups": self.matchups,
+            "total_games": self.total_games,
+            "execution_time": self.execution_time,
+            "time_percentiles": {algo: {q: sketch.quantile(q / 100) for q in (50, 90, 99)}
+                                 for algo, sketch in self.game_times.items()},
+        }
+
+
+class TournamentLog:
+    """
+    Append-only JSONL log of game results with buffered writes.
+
+    The first line holds the settings, every other line one game. Replaying
+    the log rebuilds the aggregates of an interrupted tournament.
+    """
+    def __init__(self, path: str, settings: Dict[str, Any], flush_every: int = 1000):
+        self.path = path
+        self.flush_every = flush_every
+        self.pending = 0
+        if os.path.exists(path):
+            self._truncate_partial_line()
+        has_header = os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, "a", buffering=1 << 16)
+        if not has_header:
+            self.file.write(json.dumps({"settings": settings}) + "\n")
+
+    def _truncate_partial_line(self) -> None:
+        """Drops a last line cut off by a crash, so new records start on a line of their own."""
+        with open(self.path, "rb+") as f:
+            # Scan back from the end in small blocks for the last newline
+            end = f.seek(0, os.SEEK_END)
+            position = end
+            while position > 0:
+                start = max(0, position - 4096)
+                f.seek(start)
+                block = f.read(position - start)
+                newline = block.rfind(b"\n")
+                if newline >= 0:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                f.truncate(position)
+
+    @staticmethod
+    def replay(path: str, settings: Dict[str, Any], stats: TournamentStats) -> None:
+        if not os.path.exists(path):
+            return
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if "settings" in record:
+                    if record["settings"] != settings:
+                        raise ValueError(f"{path} was written with different settings: {record['settings']}")
+                    continue
+                stats.record(record["algo1"], record["algo2"], record["winner"], record["time1"], record["time2"])
+
+    def write(self, algo1: str, algo2: str, winner: int, turns: int, algo1_time: float, algo2_time: float) -> None:
+        self.file.write(json.dumps({"algo1": algo1, "algo2": algo2, "winner": winner, "turns": turns,
+                                    "time1": algo1_time, "time2": algo2_time}) + "\n")
+        self.pending += 1
+        if self.pending >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        self.file.flush()
+        self.pending = 0
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def print_summary(stats: TournamentStats, algorithms: List[str]) -> None:
+    for algo in sorted(algorithms, key=lambda a: stats.points[a], reverse=True):
+        win_pct = (stats.wins[algo] / stats.total_games) * 100 if stats.total_games > 0 else 0
+        avg_time = stats.execution_time[algo] / stats.games(algo) if stats.games(algo) > 0 else 0
+        sketch = stats.game_times[algo]
+        print(f"{algo}: {stats.points[algo]} points - {stats.wins[algo]}W/{stats.draws[algo]}D/{stats.losses[algo]}L ({win_pct:.1f}%) "
+              f"- Avg time: {avg_time:.3f}s (p50 {sketch.quantile(0.5):.3f}s, p99 {sketch.quantile(0.99):.3f}s)")
+
+def run_tournament(settings: Dict[str, Any], num_games: int = 10, log_path: Optional[str] = None,
+                   summary_every: int = 0, verbose: bool = True) -> Dict:
     """
     Runs a tournament between all registered algorithms.
     
     Args:
         settings: Base game settings to use
         num_games: Number of games to play for each matchup
+        log_path: JSONL file every game is appended to. If it already exists
+            the tournament resumes from it, skipping the games it holds
+        summary_every: Print the standings every this many games, 0 to disable
+        verbose: Print a line per game
         
     Returns:
         Dictionary with tournament results
@@ -63,72 +235,50 @@ def run_tournament(settings: Dict[str, Any], num_games: int = 10) -> Dict:
     print(f"Each matchup will play {num_games} games")
     print(f"Game settings: k={settings['k']}, x={settings['x']}, range={settings['lower']}-{settings['bound']}")
     
-    # Initialize results
-    results = {
-        "wins": defaultdict(int),
-        "draws": defaultdict(int),
-        "losses": defaultdict(int),
-        "points": defaultdict(float),  # 1 for win, 0.5 for draw
-        "matchups": defaultdict(lambda: defaultdict(lambda: {"wins": 0, "draws": 0, "losses": 0})),
-        "total_games": 0,
-        "execution_time": defaultdict(float)
-    }
+    stats = TournamentStats()
+    log = None
+    if log_path is not None:
+        TournamentLog.replay(log_path, settings, stats)
+        if stats.total_games:
+            print(f"Resuming from {log_path}: {stats.total_games} games already played")
+        log = TournamentLog(log_path, settings)
     
     matchups = [(alg1, alg2) for alg1, alg2 in itertools.product(algorithms, algorithms) if alg1 < alg2]
     total_matchups = len(matchups)
     
     # Play games
-    for idx, (algo1, algo2) in enumerate(matchups):
-        print(f"\nMatchup {idx+1}/{total_matchups}: {algo1} vs {algo2}")
-        
-        for game_idx in range(num_games):
-            # Create a new game instance
-            k = settings["k"]
-            x = settings["x"]
-            lower = settings["lower"]
-            bound = settings["bound"]
-            game = Game(k, x, lower, bound)
-            
-            # Play the game and time it
-            winner, algo1_time, algo2_time = play_game(game, algo1, algo2)
-            game_time = algo1_time + algo2_time
-            # Record results
-            if winner == 1:  # algo1 wins
-                results["wins"][algo1] += 1
-                results["losses"][algo2] += 1
-                results["points"][algo1] += 1
-                results["matchups"][algo1][algo2]["wins"] += 1
-                results["matchups"][algo2][algo1]["losses"] += 1
-                print(f"  Game {game_idx+1}/{num_games}: {algo1} wins in {game.turn_count} turns ({game_time:.2f}s)")
-            elif winner == 2:  # algo2 wins
-                results["wins"][algo2] += 1
-                results["losses"][algo1] += 1
-                results["points"][algo2] += 1
-                results["matchups"][algo2][algo1]["wins"] += 1
-                results["matchups"][algo1][algo2]["losses"] += 1
-                print(f"  Game {game_idx+1}/{num_games}: {algo2} wins in {game.turn_count} turns ({game_time:.2f}s)")
-            else:  # draw
-                results["draws"][algo1] += 1
-                results["draws"][algo2] += 1
-                results["points"][algo1] += 0.5
-                results["points"][algo2] += 0.5
-                results["matchups"][algo1][algo2]["draws"] += 1
-                results["matchups"][algo2][algo1]["draws"] += 1
-                print(f"  Game {game_idx+1}/{num_games}: Draw after {game.turn_count} turns ({game_time:.2f}s)")
+    try:
+        for idx, (algo1, algo2) in enumerate(matchups):
+            if stats.played[(algo1, algo2)] >= num_games:
+                continue
+            print(f"\nMatchup {idx+1}/{total_matchups}: {algo1} vs {algo2}")
             
-            # Record time
-            results["execution_time"][algo1] += algo1_time 
-            results["execution_time"][algo2] += algo2_time
-            
-            results["total_games"] += 1
+            for game_idx in range(stats.played[(algo1, algo2)], num_games):
+                game = Game(settings["k"], settings["x"], settings["lower"], settings["bound"])
+                
+                # Play the game and time it
+                winner, algo1_time, algo2_time = play_game(game, algo1, algo2)
+                stats.record(algo1, algo2, winner, algo1_time, algo2_time)
+                if log is not None:
+                    log.write(algo1, algo2, winner, game.turn_count, algo1_time, algo2_time)
+                
+                if verbose:
+                    game_time = algo1_time + algo2_time
+                    if winner:
+                        print(f"  Game {game_idx+1}/{num_games}: {algo1 if winner == 1 else algo2} wins in {game.turn_count} turns ({game_time:.2f}s)")
+                    else:
+                        print(f"  Game {game_idx+1}/{num_games}: Draw after {game.turn_count} turns ({game_time:.2f}s)")
+                if summary_every and stats.total_games % summary_every == 0:
+                    print(f"\n--- {stats.total_games} games played ---")
+                    print_summary(stats, algorithms)
+    finally:
+        if log is not None:
+            log.close()
     
     # Print results
     print("\n====== TOURNAMENT RESULTS ======")
     print("\nAlgorithm Performance:")
-    for algo in sorted(algorithms, key=lambda a: results["points"][a], reverse=True):
-        win_pct = (results["wins"][algo] / results["total_games"]) * 100 if results["total_games"] > 0 else 0
-        avg_time = results["execution_time"][algo] / (results["wins"][algo] + results["losses"][algo] + results["draws"][algo]) if (results["wins"][algo] + results["losses"][algo] + results["draws"][algo]) > 0 else 0
-        print(f"{algo}: {results['points'][algo]} points - {results['wins'][algo]}W/{results['draws'][algo]}D/{results['losses'][algo]}L ({win_pct:.1f}%) - Avg time: {avg_time:.3f}s")
+    print_summary(stats, algorithms)
     
     print("\nHead-to-Head Results:")
     print("Format: [row] vs [column]: W-D-L")
@@ -143,21 +293,26 @@ def run_tournament(settings: Dict[str, Any], num_games: int = 10) -> Dict:
             if algo1 == algo2:
                 row += f"---".ljust(10)
             else:
-                wins = results["matchups"][algo1][algo2]["wins"]
-                draws = results["matchups"][algo1][algo2]["draws"]
-                losses = results["matchups"][algo1][algo2]["losses"]
+                wins = stats.matchups[algo1][algo2]["wins"]
+                draws = stats.matchups[algo1][algo2]["draws"]
+                losses = stats.matchups[algo1][algo2]["losses"]
                 row += f"{wins}-{draws}-{losses}".ljust(10)
         print(row)
     
-    return results
+    return stats.to_dict()
 
 if __name__ == "__main__":
     # Default settings
-    settings = {
-        "k": 4,
-        "x": 30,
-        "lower": 1,
-        "bound": 100,
-    }
-    
-    run_tournament(settings, num_games=10)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Round-robin tournament between all registered algorithms")
+    parser.add_argument("--games", type=int, default=10, help="games per matchup")
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--x", type=int, default=30)
+    parser.add_argument("--lower", type=int, default=1)
+    parser.add_argument("--bound", type=int, default=100)
+    parser.add_argument("--log", default=None, help="JSONL game log; an existing log is resumed")
+    parser.add_argument("--summary-every", type=int, default=100, help="games between standings, 0 to disable")
+    parser.add_argument("--verbose", action="store_true", help="print a line per game")
+    args = parser.parse_args()
+
+    settings = {"k": args.k, "x": args.x, "lower": args.lower, "bound": args.bound}
+    run_tournament(settings, args.games, args.log, args.summary_every, args.verbose)
\ No newline at end of file
@@ -0,0 +1,48 @@
+from typing import List, Set, Optional
+from utils import find_all_arithmetic_progressions, generate_random_subset_with_progression, ProgressionTracker
+
+class Game:
+    def __init__(self, k, x, lower, bound):
+        self.k: int = k
+        self.x: int = x
+        self.lower: int = lower
+        self.bound: int = bound
+        
+        try:
+            self.X, self.forced_prog = generate_random_subset_with_progression(k, x, lower, bound)
+        except Exception as e:
+            print("Error generating set:", e)
+            
+        self.all_possible: List[List[int]] = find_all_arithmetic_progressions(k, self.X)
+        if not self.all_possible:
+            print("No arithmetic progression of length", k, "found with the given settings.")
+            
+        self.player1_moves: List[int] = []
+        self.player2_moves: List[int] = []
+        
+        self.game_over: bool = False
+        self.winner: Optional[int] = None
+        self.player1_turn: bool = True
+        self.turn_count: int = 1
+        self.winning_progression = None
+        self.available_numbers: Set[int] = set(self.X)
+        self.tracker: ProgressionTracker = ProgressionTracker(self.all_possible)
+        
+    def make_move(self, value):
+        player_moves = self.player1_moves if self.player1_turn else self.player2_moves
+        player_moves.append(value)
+        self.available_numbers.remove(value)
+        
+        if self.tracker.place(value, 0 if self.player1_turn else 1):
+            self.winner = 1 if self.player1_turn else 2
+            self.game_over = True
+            self.winning_progression = self.tracker.winning_progression
+            return
+        
+        # Draw as soon as every AP holds numbers of both players
+        if not self.available_numbers or self.tracker.is_draw():
+            self.game_over = True
+            return
+        
+        self.player1_turn = not self.player1_turn
+        self.turn_count += 1
@@ -1,7 +1,7 @@
 import pygame, sys, math
 from typing import List, Dict, Any, Set, Optional
-from utils import has_arithmetic_progression, find_winning_progression, find_all_arithmetic_progressions, generate_random_subset_with_progression
 from algorithms import registry
+from engine import Game
 
 BLACK: tuple[int, int, int] = (0, 0, 0)
 WHITE: tuple[int, int, int] = (255, 255, 255)
@@ -88,52 +88,6 @@ def end_game_screen(screen: pygame.Surface, font: pygame.font.Font, winner: Opti
         pygame.display.flip()
         clock.tick(30)
 
-class Game:
-    def __init__(self, k, x, lower, bound):
-        self.k: int = k
-        self.x: int = x
-        self.lower: int = lower
-        self.bound: int = bound
-        
-        try:
-            self.X, self.forced_prog = generate_random_subset_with_progression(k, x, lower, bound)
-        except Exception as e:
-            print("Error generating set:", e)
-            
-        self.all_possible: List[List[int]] = find_all_arithmetic_progressions(k, self.X)
-        if not self.all_possible:
-            print("No arithmetic progression of length", k, "found with the given settings.")
-            
-        self.player1_moves: List[int] = []
-        self.player2_moves: List[int] = []
-        
-        self.game_over: bool = False
-        self.winner: Optional[int] = None
-        self.player1_turn: bool = True
-        self.turn_count: int = 1
-        self.winning_progression = None
-        self.available_numbers: Set[int] = set(self.X)
-        
-    def make_move(self, value):
-        player_moves = self.player1_moves if self.player1_turn else self.player2_moves
-        player_moves.append(value)
-        self.available_numbers.remove(value)
-        
-        player_moves_set = set(player_moves)
-        for ap in self.all_possible:
-            if set(ap).issubset(player_moves_set):
-                self.winner = 1 if self.player1_turn else 2
-                self.game_over = True
-                self.winning_progression = ap
-                return
-        
-        if not self.available_numbers:
-            self.game_over = True
-            return
-        
-        self.player1_turn = not self.player1_turn
-        self.turn_count += 1
-
 def run_game(settings: Dict[str, Any]) -> None:
     k: int = settings.get("k", 3)
     x: int = settings.get("x", 20)
@@ -235,7 +189,7 @@ def run_game(settings: Dict[str, Any]) -> None:
     if game.forced_prog in game.all_possible:
         game.all_possible.remove(game.forced_prog)
 
-    result: str = end_game_screen(screen, font, winner, game.forced_prog, game.all_possible, win_prog)
+    result: str = end_game_screen(screen, font, winner if game.winner else None, game.forced_prog, game.all_possible, win_prog)
     pygame.quit()
     if result == "play_again":
         run_game(settings)
@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from typing import Dict, List, Any, Optional
+
+from server import percentile
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter, payload: Dict[str, Any]) -> Dict[str, Any]:
+    writer.write((json.dumps(payload) + "\n").encode())
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+async def play_sessions(host: str, port: int, games: int, settings: Dict[str, Any],
+                        latencies: List[float], counters: Dict[str, int]) -> None:
+    """
+    Plays `games` games over one connection, choosing random moves for the human side.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(games):
+            response = await request(reader, writer, {"op": "new", **settings})
+            while not response["ok"] and response["error"] == "busy":
+                counters["busy"] += 1
+                await asyncio.sleep(0.05)
+                response = await request(reader, writer, {"op": "new", **settings})
+            if not response["ok"]:
+                counters["errors"] += 1
+                continue
+            session = response["session"]
+            available = set(response["numbers"])
+            available.discard(response["ai_move"])
+            game_over = response["game_over"]
+            while not game_over:
+                value = random.choice(list(available))
+                start_time = time.perf_counter()
+                response = await request(reader, writer, {"op": "move", "session": session, "value": value})
+                if not response["ok"]:
+                    if response["error"] == "busy":
+                        counters["busy"] += 1
+                        await asyncio.sleep(0.05)
+                        continue
+                    counters["errors"] += 1
+                    break
+                latencies.append(time.perf_counter() - start_time)
+                counters["moves"] += 1
+                available.discard(value)
+                available.discard(response["ai_move"])
+                game_over = response["game_over"]
+            await request(reader, writer, {"op": "close", "session": session})
+            counters["games"] += 1
+    finally:
+        writer.close()
+
+async def run_load(host: str, port: int, clients: int, games: int, settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Runs `clients` concurrent connections that each play `games` games.
+
+    Returns:
+        Client-side throughput and round-trip latency of moves, and the server statistics
+    """
+    latencies: List[float] = []
+    counters = {"games": 0, "moves": 0, "busy": 0, "errors": 0}
+    start_time = time.perf_counter()
+    await asyncio.gather(*(play_sessions(host, port, games, settings, latencies, counters) for _ in range(clients)))
+    elapsed = time.perf_counter() - start_time
+
+    reader, writer = await asyncio.open_connection(host, port)
+    server_stats = await request(reader, writer, {"op": "stats"})
+    writer.close()
+
+    return {
+        **counters,
+        "elapsed": elapsed,
+        "sessions_per_sec": counters["games"] / elapsed if elapsed > 0 else 0.0,
+        "moves_per_sec": counters["moves"] / elapsed if elapsed > 0 else 0.0,
+        "latency_mean": statistics.mean(latencies) if latencies else 0.0,
+        "latency_p50": percentile(latencies, 0.5),
+        "latency_p95": percentile(latencies, 0.95),
+        "latency_p99": percentile(latencies, 0.99),
+        "server": server_stats,
+    }
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Load generator for the Szemerédi's Game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--games", type=int, default=10, help="games per client")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--x", type=int, default=20)
+    parser.add_argument("--lower", type=int, default=1)
+    parser.add_argument("--bound", type=int, default=100)
+    parser.add_argument("--algorithm", default="random")
+    parser.add_argument("--first", default="player")
+    args = parser.parse_args(argv)
+
+    settings = {"k": args.k, "x": args.x, "lower": args.lower, "bound": args.bound,
+                "algorithm": args.algorithm, "first": args.first}
+    result = asyncio.run(run_load(args.host, args.port, args.clients, args.games, settings))
+
+    print(f"Played {result['games']} games ({result['moves']} moves) in {result['elapsed']:.2f}s")
+    print(f"Sessions/sec: {result['sessions_per_sec']:.2f} - moves/sec: {result['moves_per_sec']:.2f}")
+    print(f"Move latency: mean {result['latency_mean'] * 1000:.1f}ms, p50 {result['latency_p50'] * 1000:.1f}ms,"
+          f" p95 {result['latency_p95'] * 1000:.1f}ms, p99 {result['latency_p99'] * 1000:.1f}ms")
+    print(f"Busy responses: {result['busy']} - errors: {result['errors']}")
+    server = result["server"]
+    print(f"Server: {server['sessions_per_sec']:.2f} sessions/sec, {server['ai_moves']} ai moves,"
+          f" {server['fallback_moves']} fallback, {server['rejected']} rejected")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+import math
+import itertools
+from collections import defaultdict
+from typing import Dict, List, Any, Tuple, Optional
+
+from algorithms import registry
+from engine import Game
+from benchmark import play_game
+
+ELO_SCALE: float = 400 / math.log(10)
+
+
+class RatingEngine:
+    def __init__(self, algorithms: List[str], prior_games: float = 1.0):
+        self.algorithms: List[str] = list(algorithms)
+        # Pseudo-games (one draw against every opponent) keep strengths finite
+        # for players that have only won or only lost so far.
+        self.prior_games: float = prior_games
+        self.games: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.score: Dict[Tuple[str, str], float] = defaultdict(float)
+        self.wins: Dict[str, int] = defaultdict(int)
+        self.draws: Dict[str, int] = defaultdict(int)
+        self.losses: Dict[str, int] = defaultdict(int)
+        self.total_games: int = 0
+
+    def record(self, algo1: str, algo2: str, winner: int) -> None:
+        """
+        Records the result of a single game.
+
+        Args:
+            algo1: Name of the algorithm that played as player 1
+            algo2: Name of the algorithm that played as player 2
+            winner: 1 if algo1 won, 2 if algo2 won, 0 for draw
+        """
+        points = {1: 1.0, 2: 0.0}.get(winner, 0.5)
+        self.games[(algo1, algo2)] += 1
+        self.games[(algo2, algo1)] += 1
+        self.score[(algo1, algo2)] += points
+        self.score[(algo2, algo1)] += 1 - points
+        if winner == 1:
+            self.wins[algo1] += 1
+            self.losses[algo2] += 1
+        elif winner == 2:
+            self.wins[algo2] += 1
+            self.losses[algo1] += 1
+        else:
+            self.draws[algo1] += 1
+            self.draws[algo2] += 1
+        self.total_games += 1
+
+    def _pair_games(self, a: str, b: str) -> float:
+        return self.games[(a, b)] + self.prior_games
+
+    def _pair_score(self, a: str, b: str) -> float:
+        return self.score[(a, b)] + self.prior_games / 2
+
+    def strengths(self, iterations: int = 200, tol: float = 1e-9) -> Dict[str, float]:
+        """
+        Fits Bradley-Terry strengths with the MM algorithm (draws count as half a win).
+
+        Returns:
+            Dictionary mapping algorithm name to log-strength, centered on 0
+        """
+        p = {a: 1.0 for a in self.algorithms}
+        for _ in range(iterations):
+            new_p = {}
+            for a in self.algorithms:
+                won = sum(self._pair_score(a, b) for b in self.algorithms if b != a)
+                denom = sum(self._pair_games(a, b) / (p[a] + p[b]) for b in self.algorithms if b != a)
+                new_p[a] = won / denom if denom > 0 else p[a]
+            norm = math.exp(sum(math.log(v) for v in new_p.values()) / len(new_p))
+            new_p = {a: v / norm for a, v in new_p.items()}
+            delta = max(abs(new_p[a] - p[a]) for a in self.algorithms)
+            p = new_p
+            if delta < tol:
+                break
+        return {a: math.log(v) for a, v in p.items()}
+
+    def standard_errors(self, theta: Dict[str, float]) -> Dict[str, float]:
+        """
+        Approximates the standard error of each log-strength from the diagonal
+        of the Fisher information (covariances between players are ignored).
+        """
+        errors = {}
+        for a in self.algorithms:
+            info = 0.0
+            for b in self.algorithms:
+                if b == a:
+                    continue
+                prob = 1 / (1 + math.exp(theta[b] - theta[a]))
+                info += self._pair_games(a, b) * prob * (1 - prob)
+            errors[a] = 1 / math.sqrt(info) if info > 0 else float('inf')
+        return errors
+
+    def ratings(self, z: float = 1.96) -> Dict[str, Tuple[float, float, float]]:
+        """
+        Returns:
+            Dictionary mapping algorithm name to (elo, lower bound, upper bound)
+        """
+        theta = self.strengths()
+        errors = self.standard_errors(theta)
+        return {a: (ELO_SCALE * theta[a],
+                    ELO_SCALE * (theta[a] - z * errors[a]),
+                    ELO_SCALE * (theta[a] + z * errors[a])) for a in self.algorithms}
+
+    def ranking(self) -> List[str]:
+        theta = self.strengths()
+        return sorted(self.algorithms, key=lambda a: theta[a], reverse=True)
+
+    def _separation(self, a: str, b: str, theta: Dict[str, float], errors: Dict[str, float]) -> float:
+        se = math.sqrt(errors[a] ** 2 + errors[b] ** 2)
+        return abs(theta[a] - theta[b]) / se if se > 0 else float('inf')
+
+    def unsettled_pairs(self, z: float = 1.96, max_pair_games: Optional[int] = None,
+                        max_error: Optional[float] = None) -> List[Tuple[float, str, str]]:
+        """
+        Finds neighbouring pairs in the current ranking whose order is not yet
+        statistically established, or whose ratings are still too uncertain.
+
+        Args:
+            z: Separation (in standard errors) required to call a pair settled
+            max_pair_games: Pairs that already played this many games count as settled
+            max_error: Pairs where a player's confidence interval is wider than
+                +/- this many Elo points count as unsettled. A player that wins
+                (or loses) every game never gets below this, so the pair then
+                plays up to `max_pair_games`
+
+        Returns:
+            List of (separation, algo1, algo2), the pair with the largest
+            combined standard error first. Ordering by separation would spend
+            the whole budget on nearly tied pairs before anything else.
+        """
+        theta = self.strengths()
+        errors = self.standard_errors(theta)
+        order = sorted(self.algorithms, key=lambda a: theta[a], reverse=True)
+        pairs = []
+        for a, b in zip(order, order[1:]):
+            if max_pair_games is not None and self.games[(a, b)] >= max_pair_games:
+                continue
+            separation = self._separation(a, b, theta, errors)
+            error = ELO_SCALE * z * max(errors[a], errors[b])
+            if separation < z or (max_error is not None and error > max_error):
+                pairs.append((math.sqrt(errors[a] ** 2 + errors[b] ** 2), separation, a, b))
+        return [(separation, a, b) for _, separation, a, b in sorted(pairs, reverse=True)]
+
+    def is_settled(self, z: float = 1.96, max_pair_games: Optional[int] = None,
+                   max_error: Optional[float] = None) -> bool:
+        return not self.unsettled_pairs(z, max_pair_games, max_error)
+
+
+def run_rated_tournament(settings: Dict[str, Any], algorithms: Optional[List[str]] = None,
+                         min_games: int = 4, max_pair_games: int = 100, max_games: int = 2000,
+                         batch: int = 2, z: float = 1.96, max_error: Optional[float] = None) -> Dict:
+    """
+    Runs a tournament that schedules games adaptively until the ranking is settled.
+
+    Every pair first plays `min_games` games. After that, batches of games are
+    scheduled only for the unsettled neighbouring pair in the ranking whose
+    ratings are the least certain, until every neighbouring pair is separated
+    by `z` standard errors (with both ratings known to within `max_error` Elo if given),
+    has played `max_pair_games` games, or `max_games` games were played.
+
+    Args:
+        settings: Base game settings to use
+        algorithms: Names of the algorithms to rate (all registered by default)
+        min_games: Number of games every pair plays before adaptive scheduling
+        max_pair_games: Cap on the number of games for a single pair
+        max_games: Cap on the total number of games
+        batch: Number of games played for the selected pair per scheduling step
+        z: Required separation in standard errors (1.96 ~ 95% confidence)
+        max_error: Required half-width of the rating confidence intervals in Elo, None to ignore
+
+    Returns:
+        Dictionary with ratings, ranking and game counts
+    """
+    algorithms = list(algorithms) if algorithms else list(registry.keys())
+    engine = RatingEngine(algorithms)
+
+    print(f"Starting rated tournament with {len(algorithms)} algorithms: {', '.join(algorithms)}")
+    print(f"Game settings: k={settings['k']}, x={settings['x']}, range={settings['lower']}-{settings['bound']}")
+
+    def play(a: str, b: str, n: int) -> None:
+        for _ in range(n):
+            if engine.total_games >= max_games:
+                return
+            # Alternate who moves first so the first-player advantage cancels out
+            first, second = (b, a) if engine.games[(a, b)] % 2 else (a, b)
+            game = Game(settings["k"], settings["x"], settings["lower"], settings["bound"])
+            winner, _, _ = play_game(game, first, second)
+            engine.record(first, second, winner)
+
+    for a, b in itertools.combinations(algorithms, 2):
+        play(a, b, min_games)
+
+    while engine.total_games < max_games:
+        pairs = engine.unsettled_pairs(z, max_pair_games, max_error)
+        if not pairs:
+            break
+        separation, a, b = pairs[0]
+        print(f"  [{engine.total_games} games] {a} vs {b}: separation {separation:.2f}")
+        play(a, b, batch)
+
+    ratings = engine.ratings(z)
+    ranking = engine.ranking()
+    settled = engine.is_settled(z, max_error=max_error)
+
+    print("\n====== RATINGS ======")
+    print(f"Games played: {engine.total_games} ({'settled' if settled else 'not settled'})")
+    for algo in ranking:
+        elo, lo, hi = ratings[algo]
+        print(f"{algo}: {elo:7.1f} [{lo:7.1f}, {hi:7.1f}] - {engine.wins[algo]}W/{engine.draws[algo]}D/{engine.losses[algo]}L")
+
+    return {
+        "ratings": ratings,
+        "ranking": ranking,
+        "settled": settled,
+        "total_games": engine.total_games,
+        "games": {f"{a} vs {b}": engine.games[(a, b)] for a, b in itertools.combinations(algorithms, 2)},
+    }
+
+if __name__ == "__main__":
+    # Default settings
+    settings = {
+        "k": 4,
+        "x": 30,
+        "lower": 1,
+        "bound": 100,
+    }
+
+    run_rated_tournament(settings, algorithms=["random", "min", "heuristic", "heuristic_fast"])
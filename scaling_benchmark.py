@@ -0,0 +1,286 @@
+import argparse
+import itertools
+import json
+import math
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Any, Callable, Optional
+
+from algorithms import registry
+from engine import Game
+from utils import find_all_arithmetic_progressions, generate_random_subset_with_progression, is_valid_config
+
+
+def _spread(samples: List[float]) -> float:
+    """Median absolute deviation of the samples relative to their median, 0 for a single sample."""
+    median = statistics.median(samples)
+    if len(samples) < 2 or median <= 0:
+        return 0.0
+    return statistics.median(abs(t - median) for t in samples) / median
+
+def _timed(func: Callable[[], Any], repeats: int) -> Dict[str, float]:
+    """Best of `repeats` runs, which is far less sensitive to other load on the machine than the median."""
+    times = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start_time)
+    return {"time": min(times), "spread": _spread(times)}
+
+def calibrate(repeats: int = 5) -> float:
+    """
+    Times a fixed pure-Python workload, so reports from runs on a faster or
+    busier machine can be compared.
+    """
+    def workload() -> int:
+        total = 0
+        for i in range(200000):
+            total += i % 7
+        return total
+    return _timed(workload, repeats)["time"]
+
+def _peak_memory(func: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def measure_enumeration(k: int, x: int, lower: int, bound: int, repeats: int = 5) -> Dict[str, float]:
+    """
+    Measures `find_all_arithmetic_progressions` on a random board.
+
+    Returns:
+        Best time in seconds, its relative spread and peak traced memory in bytes
+    """
+    X, _ = generate_random_subset_with_progression(k, x, lower, bound)
+    return {
+        **_timed(lambda: find_all_arithmetic_progressions(k, X), repeats),
+        "peak_memory": _peak_memory(lambda: find_all_arithmetic_progressions(k, X)),
+    }
+
+def measure_make_move(k: int, x: int, lower: int, bound: int, repeats: int = 5) -> Dict[str, float]:
+    """
+    Measures `Game.make_move` over full games of uniformly random moves.
+
+    Returns:
+        Best (over games) mean time per move in seconds, its relative
+        spread and peak traced memory in bytes of setting up and playing one game
+    """
+    def play_random_game() -> float:
+        game = Game(k, x, lower, bound)
+        elapsed = 0.0
+        moves = 0
+        while not game.game_over:
+            move = random.choice(list(game.available_numbers))
+            start_time = time.perf_counter()
+            game.make_move(move)
+            elapsed += time.perf_counter() - start_time
+            moves += 1
+        return elapsed / moves
+
+    per_move = [play_random_game() for _ in range(repeats)]
+    return {"time": min(per_move), "spread": _spread(per_move), "peak_memory": _peak_memory(play_random_game)}
+
+def measure_think_time(algorithm: str, k: int, x: int, lower: int, bound: int,
+                       repeats: int = 1, max_moves: Optional[int] = None) -> Dict[str, float]:
+    """
+    Measures the per-move think time of an algorithm playing against itself.
+
+    Args:
+        repeats: Number of games played
+        max_moves: Stop measuring each game after this many moves
+
+    Returns:
+        Best (over games) mean time per move in seconds, the relative spread of
+        the per-game means and peak traced memory in bytes of one move from the initial position
+    """
+    algo_func = registry[algorithm]
+    game_means = []
+    for _ in range(repeats):
+        game = Game(k, x, lower, bound)
+        moves = 0
+        game_time = 0.0
+        while not game.game_over and (max_moves is None or moves < max_moves):
+            current, opponent = (game.player1_moves, game.player2_moves) if game.player1_turn else (game.player2_moves, game.player1_moves)
+            start_time = time.perf_counter()
+            move = algo_func(list(game.available_numbers), current, opponent, game.k)
+            game_time += time.perf_counter() - start_time
+            game.make_move(move)
+            moves += 1
+        if moves:
+            game_means.append(game_time / moves)
+    if not game_means:
+        raise ValueError("No moves were timed, repeats and max_moves must be at least 1")
+    game = Game(k, x, lower, bound)
+    peak = _peak_memory(lambda: algo_func(list(game.available_numbers), [], [], game.k))
+    return {"time": min(game_means), "spread": _spread(game_means), "peak_memory": peak}
+
+def fit_power_law(points: List[tuple[float, float]]) -> Optional[Dict[str, float]]:
+    """
+    Fits y = c * x^b by least squares in log-log space.
+
+    Returns:
+        Exponent `b`, coefficient `c` and the coefficient of determination `r2`,
+        or None if there are fewer than two distinct positive points
+    """
+    points = [(px, py) for px, py in points if px > 0 and py > 0]
+    if len({px for px, _ in points}) < 2:
+        return None
+    lx = [math.log(px) for px, _ in points]
+    ly = [math.log(py) for _, py in points]
+    mx, my = statistics.mean(lx), statistics.mean(ly)
+    sxx = sum((a - mx) ** 2 for a in lx)
+    sxy = sum((a - mx) * (b - my) for a, b in zip(lx, ly))
+    syy = sum((b - my) ** 2 for b in ly)
+    exponent = sxy / sxx
+    r2 = (sxy * sxy) / (sxx * syy) if syy > 0 else 1.0
+    return {"exponent": exponent, "coefficient": math.exp(my - exponent * mx), "r2": r2}
+
+def _row_key(row: Dict[str, Any]) -> tuple:
+    return (row["metric"], row.get("algorithm"), row["k"], row["x"], row["bound"])
+
+def run_suite(ks: List[int], xs: List[int], bounds: List[int], lower: int = 1,
+              algorithms: Optional[List[str]] = None, repeats: int = 5,
+              max_moves: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Runs the benchmark over the grid `ks` x `xs` x `bounds`.
+
+    Args:
+        ks, xs, bounds: Grids of game parameters, invalid combinations are skipped
+        lower: Lower limit of the numbers on the board
+        algorithms: Algorithms whose think time is measured (all registered by default)
+        repeats: Number of repetitions of every timing (games for make_move and think time)
+        max_moves: Number of moves measured per game for think time
+
+    Returns:
+        Dictionary with raw measurements and fitted scaling exponents in x
+    """
+    algorithms = list(algorithms) if algorithms is not None else list(registry.keys())
+    calibration = calibrate()
+    rows = []
+    for k, x, bound in itertools.product(ks, xs, bounds):
+        if not is_valid_config(k, x, lower, bound):
+            print(f"Skipping invalid configuration k={k}, x={x}, range={lower}-{bound}")
+            continue
+        print(f"Benchmarking k={k}, x={x}, range={lower}-{bound}")
+        # The same boards and random games in every run, so runs are comparable
+        random.seed(f"{k}-{x}-{lower}-{bound}")
+        measurements = [("enumeration", None, measure_enumeration(k, x, lower, bound, repeats)),
+                        ("make_move", None, measure_make_move(k, x, lower, bound, repeats))]
+        for algo in algorithms:
+            measurements.append(("think_time", algo, measure_think_time(algo, k, x, lower, bound, repeats, max_moves)))
+        for metric, algo, values in measurements:
+            rows.append({"metric": metric, "algorithm": algo, "k": k, "x": x, "bound": bound, **values})
+            label = f"{metric}[{algo}]" if algo else metric
+            print(f"  {label}: {values['time'] * 1000:.3f}ms, peak {values['peak_memory'] / 1024:.1f}KiB")
+
+    calibration = min(calibration, calibrate())
+
+    fits = []
+    groups: Dict[tuple, List[tuple[float, float]]] = {}
+    for row in rows:
+        groups.setdefault((row["metric"], row["algorithm"], row["k"], row["bound"]), []).append((row["x"], row["time"]))
+    for (metric, algo, k, bound), points in groups.items():
+        fit = fit_power_law(points)
+        if fit:
+            fits.append({"metric": metric, "algorithm": algo, "k": k, "bound": bound, "variable": "x", **fit})
+
+    return {
+        "config": {"ks": ks, "xs": xs, "bounds": bounds, "lower": lower, "algorithms": algorithms,
+                   "repeats": repeats, "max_moves": max_moves},
+        "python": sys.version.split()[0],
+        "calibration": calibration,
+        "results": rows,
+        "fits": fits,
+    }
+
+def compare_to_baseline(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2,
+                        noise: float = 3.0, min_delta: float = 1e-6) -> List[Dict[str, Any]]:
+    """
+    Compares measurements against a stored baseline report.
+
+    Args:
+        threshold: Relative slowdown (or memory growth) above which a measurement is flagged
+        noise: Times are only flagged if the slowdown also exceeds this many
+            relative spreads (the larger of baseline and current), so noisy
+            measurements need a larger slowdown
+        min_delta: Slowdowns of at most this many seconds are never flagged
+
+    Times are scaled by the ratio of the calibration timings of both reports
+    first, so a machine that is uniformly slower does not flag everything.
+
+    Returns:
+        List of regressions, one per flagged measurement
+    """
+    previous = {_row_key(row): row for row in baseline.get("results", [])}
+    scale = 1.0
+    if baseline.get("calibration") and report.get("calibration"):
+        scale = baseline["calibration"] / report["calibration"]
+    regressions = []
+    for row in report["results"]:
+        old = previous.get(_row_key(row))
+        if old is None:
+            continue
+        row = {**row, "time": row["time"] * scale}
+        for field in ("time", "peak_memory"):
+            allowed = threshold
+            if field == "time":
+                allowed = max(threshold, noise * max(old.get("spread", 0.0), row.get("spread", 0.0)))
+                if row[field] - old[field] <= min_delta:
+                    continue
+            if old[field] > 0 and row[field] > old[field] * (1 + allowed):
+                regressions.append({**{key: row[key] for key in ("metric", "algorithm", "k", "x", "bound")},
+                                    "field": field, "baseline": old[field], "current": row[field],
+                                    "ratio": row[field] / old[field]})
+    return regressions
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Scaling benchmark for Szemerédi's Game")
+    parser.add_argument("--k", type=int, nargs="+", default=[3, 4])
+    parser.add_argument("--x", type=int, nargs="+", default=[20, 40, 80])
+    parser.add_argument("--bound", type=int, nargs="+", default=[100, 200])
+    parser.add_argument("--lower", type=int, default=1)
+    parser.add_argument("--algorithms", nargs="*", default=None)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--max-moves", type=int, default=None)
+    parser.add_argument("--output", default="scaling_results.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--noise", type=float, default=3.0, help="slowdowns within this many relative spreads are not flagged")
+    parser.add_argument("--min-delta", type=float, default=1e-6, help="slowdowns of at most this many seconds are not flagged")
+    args = parser.parse_args(argv)
+    if args.repeats < 1 or (args.max_moves is not None and args.max_moves < 1):
+        parser.error("--repeats and --max-moves must be at least 1")
+
+    report = run_suite(args.k, args.x, args.bound, args.lower, args.algorithms, args.repeats, args.max_moves)
+
+    print("\n====== SCALING (time ~ c * x^b) ======")
+    for fit in report["fits"]:
+        label = f"{fit['metric']}[{fit['algorithm']}]" if fit["algorithm"] else fit["metric"]
+        print(f"{label} k={fit['k']} bound={fit['bound']}: b={fit['exponent']:.2f} (r2={fit['r2']:.2f})")
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.threshold, args.noise, args.min_delta)
+        for reg in regressions:
+            label = f"{reg['metric']}[{reg['algorithm']}]" if reg["algorithm"] else reg["metric"]
+            print(f"REGRESSION {label} k={reg['k']} x={reg['x']} bound={reg['bound']} {reg['field']}: "
+                  f"{reg['baseline']:.6g} -> {reg['current']:.6g} (x{reg['ratio']:.2f})")
+        if regressions:
+            return 1
+        print(f"No regressions above {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
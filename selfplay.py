@@ -0,0 +1,202 @@
+import argparse
+import glob
+import os
+import random
+import time
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from engine import Game
+from algorithms import mcts
+from algorithms.policy import NUM_FEATURES, PolicyModel, move_features, softmax, WEIGHTS_PATH
+
+
+class ShardWriter:
+    """
+    Streams self-play records to compressed shards of `shard_size` positions.
+
+    Every shard holds the move features of all positions stacked in `features`,
+    the visit distribution in `visits` and the played numbers in `moves`, with
+    `offsets[i]:offsets[i + 1]` selecting the rows of position i. `outcomes`
+    holds the final result from the point of view of the player to move.
+    """
+    def __init__(self, directory: str, shard_size: int = 1000):
+        self.directory = directory
+        self.shard_size = shard_size
+        os.makedirs(directory, exist_ok=True)
+        indices = [int(os.path.basename(path)[len("shard_"):-len(".npz")])
+                   for path in glob.glob(os.path.join(directory, "shard_*.npz"))]
+        self.shard_index = max(indices, default=-1) + 1
+        self._reset()
+
+    def _reset(self) -> None:
+        self.features: List[np.ndarray] = []
+        self.visits: List[np.ndarray] = []
+        self.moves: List[np.ndarray] = []
+        self.outcomes: List[float] = []
+
+    def add(self, features: np.ndarray, visits: np.ndarray, moves: List[int], outcome: float) -> None:
+        self.features.append(features)
+        self.visits.append(visits)
+        self.moves.append(np.asarray(moves, dtype=np.int32))
+        self.outcomes.append(outcome)
+        if len(self.outcomes) >= self.shard_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.outcomes:
+            return
+        offsets = np.zeros(len(self.features) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(f) for f in self.features])
+        path = os.path.join(self.directory, f"shard_{self.shard_index:05d}.npz")
+        # Write to a temporary file outside the shard_*.npz pattern first, so
+        # readers never see a partial shard
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez_compressed(f, features=np.concatenate(self.features), visits=np.concatenate(self.visits),
+                                moves=np.concatenate(self.moves), offsets=offsets,
+                                outcomes=np.asarray(self.outcomes, dtype=np.float32))
+        os.replace(tmp_path, path)
+        self.shard_index += 1
+        self._reset()
+
+def self_play_game(settings: Dict[str, Any], simulations: int, explore_moves: int) -> List[tuple]:
+    """
+    Plays one game of MCTS against itself.
+
+    The first `explore_moves` moves are sampled from the visit distribution,
+    later moves take the most visited child. Positions solved by the endgame
+    table get a one-hot target.
+
+    Returns:
+        List of (features, visit distribution, moves, outcome) records
+    """
+    game = Game(settings["k"], settings["x"], settings["lower"], settings["bound"])
+    positions = []
+    while not game.game_over:
+        if game.player1_turn:
+            current, opponent = game.player1_moves, game.player2_moves
+        else:
+            current, opponent = game.player2_moves, game.player1_moves
+        available = sorted(game.available_numbers)
+        root = mcts.make_root(available, current, opponent, game.k)
+        features = move_features(root.tracker, available, 0)
+        visits = np.zeros(len(available), dtype=np.float32)
+        if len(available) <= mcts.ENDGAME_CELLS:
+            move = mcts.solve_endgame(available, current, opponent, game.k)
+            visits[available.index(move)] = 1.0
+        else:
+            mcts.search(root, simulations)
+            for child in root.children:
+                visits[available.index(child.move)] = child.visits
+            visits /= visits.sum()
+            if len(positions) < explore_moves:
+                move = available[int(np.random.choice(len(available), p=visits))]
+            else:
+                move = available[int(np.argmax(visits))]
+        positions.append((features, visits, available, game.player1_turn))
+        game.make_move(move)
+
+    records = []
+    for features, visits, available, player1 in positions:
+        if game.winner is None:
+            outcome = 0.0
+        else:
+            outcome = 1.0 if (game.winner == 1) == player1 else -1.0
+        records.append((features, visits, available, outcome))
+    return records
+
+def generate(directory: str, settings: Dict[str, Any], games: int, simulations: int = 400,
+             explore_moves: int = 6, shard_size: int = 1000) -> int:
+    """
+    Generates self-play games and streams their records into shards.
+
+    Returns:
+        Number of positions written
+    """
+    writer = ShardWriter(directory, shard_size)
+    positions = 0
+    start_time = time.time()
+    for game_idx in range(games):
+        records = self_play_game(settings, simulations, explore_moves)
+        for record in records:
+            writer.add(*record)
+        positions += len(records)
+        print(f"  Game {game_idx+1}/{games}: {len(records)} positions ({time.time() - start_time:.1f}s)")
+    writer.flush()
+    return positions
+
+def load_shards(directory: str) -> List[tuple]:
+    """
+    Returns:
+        List of (features, visit distribution, outcome) per position
+    """
+    positions = []
+    for path in sorted(glob.glob(os.path.join(directory, "shard_*.npz"))):
+        with np.load(path) as data:
+            features, visits, offsets, outcomes = data["features"], data["visits"], data["offsets"], data["outcomes"]
+        for i, outcome in enumerate(outcomes):
+            rows = slice(offsets[i], offsets[i + 1])
+            positions.append((features[rows], visits[rows], float(outcome)))
+    return positions
+
+def train(positions: List[tuple], epochs: int = 10, lr: float = 0.01, l2: float = 1e-4,
+          model: Optional[PolicyModel] = None) -> PolicyModel:
+    """
+    Trains the linear policy/value model with plain SGD: cross-entropy against
+    the visit distributions for the policy, squared error against the game
+    outcomes for the value.
+    """
+    model = model or PolicyModel(np.zeros(NUM_FEATURES, dtype=np.float32))
+    for epoch in range(epochs):
+        random.shuffle(positions)
+        policy_loss = value_loss = 0.0
+        for features, visits, outcome in positions:
+            probs = softmax(model.logits(features))
+            policy_loss -= float(visits @ np.log(probs + 1e-9))
+            model.policy -= lr * (features.T @ (probs - visits) + l2 * model.policy)
+
+            pooled = features.mean(axis=0)
+            value = np.tanh(pooled @ model.value + model.bias)
+            value_loss += float((value - outcome) ** 2)
+            grad = 2 * (value - outcome) * (1 - value ** 2)
+            model.value -= lr * (grad * pooled + l2 * model.value)
+            model.bias -= lr * float(grad)
+        n = max(1, len(positions))
+        print(f"  Epoch {epoch+1}/{epochs}: policy loss {policy_loss / n:.4f}, value loss {value_loss / n:.4f}")
+    return model
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Self-play data and policy training for Szemerédi's Game")
+    commands = parser.add_subparsers(dest="command", required=True)
+    gen = commands.add_parser("generate", help="generate self-play shards")
+    gen.add_argument("--out", default="selfplay_data")
+    gen.add_argument("--games", type=int, default=20)
+    gen.add_argument("--simulations", type=int, default=400)
+    gen.add_argument("--explore-moves", type=int, default=6)
+    gen.add_argument("--shard-size", type=int, default=1000)
+    gen.add_argument("--k", type=int, default=4)
+    gen.add_argument("--x", type=int, default=30)
+    gen.add_argument("--lower", type=int, default=1)
+    gen.add_argument("--bound", type=int, default=100)
+    fit = commands.add_parser("train", help="train the policy model on shards")
+    fit.add_argument("--data", default="selfplay_data")
+    fit.add_argument("--out", default=WEIGHTS_PATH)
+    fit.add_argument("--epochs", type=int, default=10)
+    fit.add_argument("--lr", type=float, default=0.01)
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        settings = {"k": args.k, "x": args.x, "lower": args.lower, "bound": args.bound}
+        positions = generate(args.out, settings, args.games, args.simulations, args.explore_moves, args.shard_size)
+        print(f"Wrote {positions} positions to {args.out}")
+    else:
+        positions = load_shards(args.data)
+        print(f"Training on {len(positions)} positions")
+        model = train(positions, args.epochs, args.lr)
+        model.save(args.out)
+        print(f"Model written to {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import statistics
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional
+
+from engine import Game
+from utils import is_valid_config
+from algorithms import registry
+
+
+def choose_move(algorithm: str, available: List[int], current: List[int], opponent: List[int], k: int) -> int:
+    """Runs an algorithm inside a worker process of the pool."""
+    algo_func = registry.get(algorithm, registry.get("random"))
+    return algo_func(available, current, opponent, k)
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Busy(Exception):
+    pass
+
+
+class Session:
+    def __init__(self, game: Game, algorithm: str, player_first: bool, budget: float):
+        self.game = game
+        self.algorithm = algorithm
+        self.player_first = player_first
+        self.budget = budget  # Remaining AI thinking time in seconds
+
+    def player_turn(self) -> bool:
+        return self.game.player1_turn == self.player_first
+
+    def state(self) -> Dict[str, Any]:
+        winner = None
+        if self.game.winner:
+            winner = "player" if (self.game.winner == 1) == self.player_first else "computer"
+        return {"game_over": self.game.game_over, "winner": winner,
+                "winning_progression": self.game.winning_progression, "turn": self.game.turn_count}
+
+
+class GameServer:
+    """
+    Hosts many concurrent games over a line-delimited JSON protocol.
+
+    Every request is one JSON object per line with an "op" field:
+        {"op": "new", "k": 3, "x": 20, "lower": 1, "bound": 100, "algorithm": "random", "first": "player"}
+        {"op": "move", "session": 1, "value": 17}
+        {"op": "close", "session": 1}
+        {"op": "stats"}
+    and is answered with one JSON object per line with an "ok" field.
+    Sessions belong to the connection that created them.
+    """
+    def __init__(self, workers: int = 4, max_pending: int = 64, max_sessions: int = 10000,
+                 move_timeout: float = 5.0, session_budget: float = 60.0, max_x: int = 200,
+                 max_range: int = 10000):
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        self.slots = asyncio.Semaphore(workers)
+        self.max_pending = max_pending
+        self.pending = 0
+        self.max_sessions = max_sessions
+        self.move_timeout = move_timeout
+        self.session_budget = session_budget
+        # Games are set up on the event loop, so their size and the range the
+        # numbers are drawn from are capped
+        self.max_x = max_x
+        self.max_range = max_range
+        self.sessions: Dict[int, Session] = {}
+        self.ids = itertools.count(1)
+        self.started = time.monotonic()
+        self.sessions_started = 0
+        self.sessions_finished = 0
+        self.ai_moves = 0
+        self.fallback_moves = 0
+        self.rejected = 0
+        self.latencies: deque = deque(maxlen=10000)
+
+    async def ai_move(self, session: Session) -> int:
+        """
+        Computes the computer's move in the process pool.
+
+        If the session budget or the move timeout runs out, or the algorithm
+        fails, a random move is played instead.
+        """
+        game = session.game
+        if game.player1_turn:
+            current, opponent = game.player1_moves, game.player2_moves
+        else:
+            current, opponent = game.player2_moves, game.player1_moves
+        available = list(game.available_numbers)
+        timeout = min(self.move_timeout, session.budget)
+        if timeout <= 0:
+            self.fallback_moves += 1
+            return random.choice(available)
+        self.pending += 1
+        try:
+            await self.slots.acquire()
+            start_time = time.monotonic()
+            future = asyncio.get_running_loop().run_in_executor(
+                self.pool, choose_move, session.algorithm, available, current[:], opponent[:], game.k)
+            future.add_done_callback(self._release)
+            try:
+                # A timed out worker keeps running until the algorithm returns, so
+                # the future is shielded and frees its slot only when it is done.
+                move = await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError:
+                move = None
+            except Exception as e:
+                print(f"Algorithm {session.algorithm} failed:", e)
+                move = None
+            session.budget -= time.monotonic() - start_time
+        finally:
+            self.pending -= 1
+        if move not in game.available_numbers:
+            self.fallback_moves += 1
+            return random.choice(available)
+        self.ai_moves += 1
+        return move
+
+    def _release(self, future: asyncio.Future) -> None:
+        self.slots.release()
+        if not future.cancelled():
+            future.exception()
+
+    async def play_ai(self, session: Session) -> Optional[int]:
+        if session.game.game_over or session.player_turn():
+            return None
+        move = await self.ai_move(session)
+        session.game.make_move(move)
+        if session.game.game_over:
+            self.sessions_finished += 1
+        return move
+
+    def admit(self) -> None:
+        """Rejects requests with Busy while `max_pending` moves already wait for a worker."""
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise Busy()
+
+    async def handle_new(self, request: Dict[str, Any], owned: set) -> Dict[str, Any]:
+        k = int(request.get("k", 3))
+        x = int(request.get("x", 20))
+        lower = int(request.get("lower", 1))
+        bound = int(request.get("bound", 100))
+        if not is_valid_config(k, x, lower, bound) or x > self.max_x or bound - lower + 1 > self.max_range:
+            return {"ok": False, "error": "invalid settings"}
+        algorithm = str(request.get("algorithm", "random")).lower()
+        if algorithm not in registry:
+            return {"ok": False, "error": f"unknown algorithm {algorithm!r}"}
+        if len(self.sessions) >= self.max_sessions:
+            self.rejected += 1
+            return {"ok": False, "error": "too many sessions"}
+        self.admit()
+        session = Session(Game(k, x, lower, bound), algorithm,
+                          str(request.get("first", "player")).lower() == "player", self.session_budget)
+        session_id = next(self.ids)
+        self.sessions[session_id] = session
+        owned.add(session_id)
+        self.sessions_started += 1
+        ai_move = await self.play_ai(session)
+        return {"ok": True, "session": session_id, "numbers": session.game.X, "ai_move": ai_move, **session.state()}
+
+    async def handle_move(self, request: Dict[str, Any], owned: set) -> Dict[str, Any]:
+        session_id = request.get("session")
+        if session_id not in owned:
+            return {"ok": False, "error": "unknown session"}
+        session = self.sessions[session_id]
+        value = request.get("value")
+        if session.game.game_over or not session.player_turn():
+            return {"ok": False, "error": "not your turn"}
+        if value not in session.game.available_numbers:
+            return {"ok": False, "error": "invalid move"}
+        self.admit()
+        session.game.make_move(value)
+        if session.game.game_over:
+            self.sessions_finished += 1
+        ai_move = await self.play_ai(session)
+        return {"ok": True, "session": session_id, "ai_move": ai_move, **session.state()}
+
+    def handle_close(self, request: Dict[str, Any], owned: set) -> Dict[str, Any]:
+        session_id = request.get("session")
+        if session_id not in owned:
+            return {"ok": False, "error": "unknown session"}
+        owned.discard(session_id)
+        del self.sessions[session_id]
+        return {"ok": True, "session": session_id}
+
+    def stats(self) -> Dict[str, Any]:
+        elapsed = time.monotonic() - self.started
+        latencies = list(self.latencies)
+        return {
+            "uptime": elapsed,
+            "active_sessions": len(self.sessions),
+            "sessions_started": self.sessions_started,
+            "sessions_finished": self.sessions_finished,
+            "sessions_per_sec": self.sessions_finished / elapsed if elapsed > 0 else 0.0,
+            "ai_moves": self.ai_moves,
+            "fallback_moves": self.fallback_moves,
+            "rejected": self.rejected,
+            "pending": self.pending,
+            "latency_mean": statistics.mean(latencies) if latencies else 0.0,
+            "latency_p50": percentile(latencies, 0.5),
+            "latency_p95": percentile(latencies, 0.95),
+            "latency_p99": percentile(latencies, 0.99),
+        }
+
+    async def dispatch(self, request: Dict[str, Any], owned: set) -> Dict[str, Any]:
+        op = request.get("op")
+        if op == "new":
+            return await self.handle_new(request, owned)
+        if op == "move":
+            start_time = time.monotonic()
+            response = await self.handle_move(request, owned)
+            self.latencies.append(time.monotonic() - start_time)
+            return response
+        if op == "close":
+            return self.handle_close(request, owned)
+        if op == "stats":
+            return {"ok": True, **self.stats()}
+        return {"ok": False, "error": f"unknown op {op!r}"}
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        owned: set = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError
+                except ValueError:
+                    response = {"ok": False, "error": "malformed request"}
+                else:
+                    try:
+                        response = await self.dispatch(request, owned)
+                    except Busy:
+                        response = {"ok": False, "error": "busy"}
+                    except (TypeError, ValueError):
+                        # Fields of the wrong type, e.g. {"k": "abc"} or {"session": [1]}
+                        response = {"ok": False, "error": "invalid request"}
+                    if "id" in request:
+                        response["id"] = request["id"]
+                writer.write((json.dumps(response) + "\n").encode())
+                # Stop reading from clients that do not consume their responses
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            for session_id in owned:
+                self.sessions.pop(session_id, None)
+            writer.close()
+
+    async def report(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            s = self.stats()
+            print(f"[{s['uptime']:.0f}s] sessions: {s['active_sessions']} active, {s['sessions_per_sec']:.2f}/s finished"
+                  f" - moves: {s['ai_moves']} ai, {s['fallback_moves']} fallback, {s['rejected']} rejected"
+                  f" - latency p50 {s['latency_p50'] * 1000:.1f}ms p95 {s['latency_p95'] * 1000:.1f}ms")
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765, report_interval: float = 10.0) -> None:
+        server = await asyncio.start_server(self.handle_client, host, port)
+        print(f"Serving Szemerédi's Game on {host}:{port}")
+        reporter = asyncio.create_task(self.report(report_interval)) if report_interval > 0 else None
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if reporter:
+                reporter.cancel()
+            self.pool.shutdown(cancel_futures=True)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Headless game server for Szemerédi's Game")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--max-sessions", type=int, default=10000)
+    parser.add_argument("--move-timeout", type=float, default=5.0)
+    parser.add_argument("--session-budget", type=float, default=60.0)
+    parser.add_argument("--max-x", type=int, default=200, help="largest board a session may ask for")
+    parser.add_argument("--max-range", type=int, default=10000, help="largest range (bound - lower + 1) of the numbers")
+    parser.add_argument("--report-interval", type=float, default=10.0)
+    args = parser.parse_args(argv)
+
+    async def run() -> None:
+        server = GameServer(args.workers, args.max_pending, args.max_sessions, args.move_timeout, args.session_budget,
+                            args.max_x, args.max_range)
+        await server.serve(args.host, args.port, args.report_interval)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
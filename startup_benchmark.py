@@ -0,0 +1,77 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+# Statements timed in a fresh interpreter, from cheapest to most expensive
+SCENARIOS: Dict[str, str] = {
+    "import registry": "import algorithms",
+    "list algorithms": "from algorithms import registry; list(registry)",
+    "load random": "from algorithms import registry; registry['random']",
+    "load mcts": "from algorithms import registry; registry['mcts']",
+    "load all": "from algorithms import registry; [registry[name] for name in registry]",
+    "import engine": "import engine",
+    "import main": "import main",
+}
+
+TIMER = "import time; _start = time.perf_counter(); {statement}; print(time.perf_counter() - _start)"
+
+
+def time_statement(statement: str, repeats: int = 10) -> float:
+    """
+    Times a statement in fresh interpreters so no module is cached.
+
+    Returns:
+        Median wall time in seconds
+    """
+    env = {**os.environ, "PYGAME_HIDE_SUPPORT_PROMPT": "1"}
+    times = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", TIMER.format(statement=statement)],
+                                capture_output=True, text=True, check=True, env=env,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        times.append(float(output.stdout.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+def slowest_imports(statement: str, top: int = 10) -> List[tuple[int, str]]:
+    """
+    Runs a statement with `-X importtime`.
+
+    Returns:
+        The `top` modules with the largest cumulative import time in microseconds
+    """
+    env = {**os.environ, "PYGAME_HIDE_SUPPORT_PROMPT": "1"}
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            capture_output=True, text=True, check=True, env=env,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    modules = []
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules.append((int(cumulative), name.rstrip()))
+    return sorted(modules, reverse=True)[:top]
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Import time measurements for Szemerédi's Game")
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--scenarios", nargs="*", default=list(SCENARIOS))
+    parser.add_argument("--detail", type=int, default=0, help="show the N slowest imports of each scenario")
+    args = parser.parse_args(argv)
+
+    for scenario in args.scenarios:
+        statement = SCENARIOS[scenario]
+        try:
+            elapsed = time_statement(statement, args.repeats)
+        except subprocess.CalledProcessError as e:
+            print(f"{scenario}: failed ({e.stderr.strip().splitlines()[-1]})")
+            continue
+        print(f"{scenario}: {elapsed * 1000:.1f}ms")
+        if args.detail:
+            for cumulative, name in slowest_imports(statement, args.detail):
+                print(f"    {cumulative / 1000:8.1f}ms {name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+import argparse
+import csv
+import glob
+import itertools
+import json
+import os
+import random
+import socket
+import time
+import zlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Set
+
+from engine import Game
+from benchmark import play_game
+from utils import is_valid_config
+
+# Layout of a sweep directory:
+#   grid.json              the parameter grid and its jobs
+#   queue/pending/*.json   jobs waiting for a worker
+#   queue/claimed/*.json   jobs a worker is running
+#   results/*.jsonl        append-only results, one file per worker process
+#   outcomes.csv, runtime.csv  merged tables
+
+
+def plan_jobs(ks: List[int], xs: List[int], bounds: List[int], algorithms: List[str],
+              games: int, games_per_job: int, lower: int = 1) -> List[Dict[str, Any]]:
+    """
+    Shards the grid into jobs of at most `games_per_job` games.
+
+    Every ordered pair of algorithms is played, the first one always moves
+    first. Job ids are derived from the parameters, so planning the same grid
+    again yields the same jobs.
+    """
+    jobs = []
+    for k, x, bound in itertools.product(ks, xs, bounds):
+        if not is_valid_config(k, x, lower, bound):
+            continue
+        for algo1, algo2 in itertools.product(algorithms, algorithms):
+            for shard, start in enumerate(range(0, games, games_per_job)):
+                job_id = f"k{k}-x{x}-l{lower}-b{bound}-{algo1}-{algo2}-{shard}"
+                jobs.append({"id": job_id, "k": k, "x": x, "lower": lower, "bound": bound,
+                             "algo1": algo1, "algo2": algo2, "games": min(games_per_job, games - start),
+                             "seed": zlib.crc32(job_id.encode())})
+    return jobs
+
+def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+    random.seed(job["seed"])
+    result = {"id": job["id"], "wins1": 0, "wins2": 0, "draws": 0, "time1": 0.0, "time2": 0.0, "turns": 0}
+    start_time = time.time()
+    for _ in range(job["games"]):
+        game = Game(job["k"], job["x"], job["lower"], job["bound"])
+        winner, algo1_time, algo2_time = play_game(game, job["algo1"], job["algo2"])
+        result["wins1" if winner == 1 else "wins2" if winner == 2 else "draws"] += 1
+        result["time1"] += algo1_time
+        result["time2"] += algo2_time
+        result["turns"] += game.turn_count
+    result["elapsed"] = time.time() - start_time
+    return result
+
+
+class ResultStore:
+    """Append-only job results, one JSON line per finished job."""
+    def __init__(self, directory: str):
+        self.directory = os.path.join(directory, "results")
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f"{socket.gethostname()}-{os.getpid()}.jsonl")
+
+    def append(self, result: Dict[str, Any]) -> None:
+        with open(self.path, "a") as f:
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the results by job id, skipping lines cut off by a crash and duplicates."""
+        results = {}
+        for path in sorted(glob.glob(os.path.join(self.directory, "*.jsonl"))):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        result = json.loads(line)
+                    except ValueError:
+                        continue
+                    results.setdefault(result["id"], result)
+        return results
+
+    def finished(self) -> Set[str]:
+        return set(self.load())
+
+
+def load_grid(directory: str) -> Dict[str, Any]:
+    with open(os.path.join(directory, "grid.json")) as f:
+        return json.load(f)
+
+def save_grid(directory: str, grid: Dict[str, Any]) -> None:
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, "grid.json")
+    with open(path + ".tmp", "w") as f:
+        json.dump(grid, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+def enqueue(directory: str, jobs: List[Dict[str, Any]]) -> int:
+    """
+    Puts the unfinished jobs that are not already queued or claimed into the queue.
+
+    Returns:
+        Number of jobs added
+    """
+    pending = os.path.join(directory, "queue", "pending")
+    claimed = os.path.join(directory, "queue", "claimed")
+    os.makedirs(pending, exist_ok=True)
+    os.makedirs(claimed, exist_ok=True)
+    finished = ResultStore(directory).finished()
+    queued = {os.path.basename(p).split(".json")[0] for p in glob.glob(os.path.join(pending, "*.json*")) + glob.glob(os.path.join(claimed, "*.json*"))}
+    added = 0
+    for job in jobs:
+        if job["id"] in finished or job["id"] in queued:
+            continue
+        path = os.path.join(pending, job["id"] + ".json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(job, f)
+        os.replace(path + ".tmp", path)
+        added += 1
+    return added
+
+def requeue_stale(directory: str, timeout: float) -> int:
+    """
+    Moves jobs claimed longer than `timeout` seconds ago back to the queue,
+    e.g. after their worker crashed. Finished jobs are dropped instead.
+
+    Returns:
+        Number of jobs put back
+    """
+    pending = os.path.join(directory, "queue", "pending")
+    finished = ResultStore(directory).finished()
+    requeued = 0
+    for path in glob.glob(os.path.join(directory, "queue", "claimed", "*.json.*")):
+        if time.time() - os.path.getmtime(path) < timeout:
+            continue
+        job_id = os.path.basename(path).split(".json")[0]
+        try:
+            if job_id in finished:
+                os.remove(path)
+            else:
+                os.replace(path, os.path.join(pending, job_id + ".json"))
+                requeued += 1
+        except FileNotFoundError:
+            pass  # Another process got there first
+    return requeued
+
+def claim(directory: str) -> Optional[str]:
+    """Atomically claims a pending job by renaming it. Returns the claimed path or None."""
+    pending = os.path.join(directory, "queue", "pending")
+    claimed = os.path.join(directory, "queue", "claimed")
+    for path in sorted(glob.glob(os.path.join(pending, "*.json"))):
+        target = os.path.join(claimed, f"{os.path.basename(path)}.{socket.gethostname()}-{os.getpid()}")
+        try:
+            os.rename(path, target)
+        except FileNotFoundError:
+            continue  # Claimed by another worker
+        os.utime(target)
+        return target
+    return None
+
+def worker(directory: str, stale_timeout: float = 3600.0) -> int:
+    """
+    Runs queued jobs until the queue is empty and no stale claims are left
+    to put back.
+
+    Returns:
+        Number of jobs run by this worker
+    """
+    store = ResultStore(directory)
+    done = 0
+    requeue_stale(directory, stale_timeout)
+    # Read once; a job finished by another worker in the meantime is at worst
+    # run twice, and merge keeps the first result
+    finished = store.finished()
+    while True:
+        path = claim(directory)
+        if path is None:
+            # Pick up the jobs of workers that died while this one was running
+            if requeue_stale(directory, stale_timeout):
+                continue
+            return done
+        with open(path) as f:
+            job = json.load(f)
+        if job["id"] not in finished:
+            result = run_job(job)
+            store.append(result)
+            finished.add(job["id"])
+            done += 1
+            print(f"  {job['id']}: {result['wins1']}W/{result['draws']}D/{result['wins2']}L ({result['elapsed']:.1f}s)")
+        os.remove(path)
+
+def run_local(directory: str, workers: int = 4) -> int:
+    """
+    Runs the unfinished jobs of the grid on a local process pool.
+
+    The queue is not used, so the files in queue/pending stay behind. A worker
+    started later removes the ones that were finished without running them.
+
+    Returns:
+        Number of jobs run, failed jobs are left for the next run
+    """
+    store = ResultStore(directory)
+    finished = store.finished()
+    jobs = [job for job in load_grid(directory)["jobs"] if job["id"] not in finished]
+    print(f"{len(finished)} jobs already finished, running {len(jobs)}")
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_job, job): job for job in jobs}
+        for idx, future in enumerate(as_completed(futures)):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"  [{idx+1}/{len(jobs)}] {futures[future]['id']} failed: {e!r}")
+                continue
+            store.append(result)
+            done += 1
+            print(f"  [{idx+1}/{len(jobs)}] {result['id']}: {result['wins1']}W/{result['draws']}D/{result['wins2']}L ({result['elapsed']:.1f}s)")
+    return done
+
+def merge(directory: str) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Merges the finished jobs into per-setting tables and writes them as CSV.
+
+    Returns:
+        "outcomes": first-player score per (k, x, bound, algo1, algo2) cell and
+        "runtime": mean think time per game for the same cells
+    """
+    grid = load_grid(directory)
+    results = ResultStore(directory).load()
+    cells: Dict[tuple, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    expected: Dict[tuple, int] = defaultdict(int)
+    for job in grid["jobs"]:
+        key = (job["k"], job["x"], job["bound"], job["algo1"], job["algo2"])
+        expected[key] += job["games"]
+        result = results.get(job["id"])
+        if result is None:
+            continue
+        cell = cells[key]
+        cell["games"] += job["games"]
+        for field in ("wins1", "wins2", "draws", "time1", "time2", "turns"):
+            cell[field] += result[field]
+
+    outcomes, runtime = [], []
+    for key in sorted(expected):
+        k, x, bound, algo1, algo2 = key
+        cell = cells.get(key, {"games": 0})
+        games = cell["games"]
+        base = {"k": k, "x": x, "bound": bound, "algo1": algo1, "algo2": algo2,
+                "games": int(games), "expected": expected[key]}
+        if games:
+            outcomes.append({**base, "first_wins": cell["wins1"] / games, "second_wins": cell["wins2"] / games,
+                             "draws": cell["draws"] / games,
+                             "first_score": (cell["wins1"] + 0.5 * cell["draws"]) / games})
+            runtime.append({**base, "time1": cell["time1"] / games, "time2": cell["time2"] / games,
+                            "turns": cell["turns"] / games})
+        else:
+            outcomes.append(base)
+            runtime.append(base)
+
+    for name, rows in (("outcomes", outcomes), ("runtime", runtime)):
+        fields = list(dict.fromkeys(field for row in rows for field in row))
+        with open(os.path.join(directory, f"{name}.csv"), "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+    return {"outcomes": outcomes, "runtime": runtime}
+
+def print_outcome_map(outcomes: List[Dict[str, Any]]) -> None:
+    """Prints the first-player score per (k, x, bound) averaged over all algorithm pairs."""
+    scores: Dict[tuple, List[float]] = defaultdict(list)
+    for row in outcomes:
+        if row["games"]:
+            scores[(row["k"], row["x"], row["bound"])].append(row["first_score"])
+    print("\n====== FIRST PLAYER SCORE ======")
+    print("k".ljust(4) + "x".ljust(6) + "bound".ljust(8) + "score")
+    for (k, x, bound), values in sorted(scores.items()):
+        print(f"{k}".ljust(4) + f"{x}".ljust(6) + f"{bound}".ljust(8) + f"{sum(values) / len(values):.3f}")
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Resumable parameter sweeps for Szemerédi's Game")
+    parser.add_argument("--dir", default="sweep")
+    commands = parser.add_subparsers(dest="command", required=True)
+    plan = commands.add_parser("plan", help="create the grid and queue its jobs")
+    plan.add_argument("--k", type=int, nargs="+", default=[3, 4])
+    plan.add_argument("--x", type=int, nargs="+", default=[20, 30, 40])
+    plan.add_argument("--bound", type=int, nargs="+", default=[60, 100])
+    plan.add_argument("--lower", type=int, default=1)
+    plan.add_argument("--algorithms", nargs="+", default=["random", "heuristic_fast"])
+    plan.add_argument("--games", type=int, default=20, help="games per cell")
+    plan.add_argument("--games-per-job", type=int, default=5)
+    local = commands.add_parser("local", help="run unfinished jobs on a local process pool")
+    local.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    work = commands.add_parser("worker", help="run jobs from the queue until it is empty")
+    work.add_argument("--stale-timeout", type=float, default=3600.0)
+    commands.add_parser("merge", help="merge finished jobs into outcome and runtime tables")
+    args = parser.parse_args(argv)
+
+    if args.command == "plan":
+        jobs = plan_jobs(args.k, args.x, args.bound, args.algorithms, args.games, args.games_per_job, args.lower)
+        save_grid(args.dir, {"k": args.k, "x": args.x, "bound": args.bound, "lower": args.lower,
+                             "algorithms": args.algorithms, "games": args.games, "jobs": jobs})
+        print(f"Planned {len(jobs)} jobs, queued {enqueue(args.dir, jobs)}")
+    elif args.command == "local":
+        run_local(args.dir, args.workers)
+    elif args.command == "worker":
+        print(f"Worker finished {worker(args.dir, args.stale_timeout)} jobs")
+    else:
+        tables = merge(args.dir)
+        done = sum(1 for row in tables["outcomes"] if row["games"] == row["expected"])
+        print(f"{done}/{len(tables['outcomes'])} cells complete, tables written to {args.dir}")
+        print_outcome_map(tables["outcomes"])
+
+if __name__ == "__main__":
+    main()
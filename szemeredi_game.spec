@@ -3,7 +3,9 @@ a = Analysis(['main.py'],
              pathex=['.'],
              binaries=[],
              datas=[('algorithms/*.py','algorithms')],
-             hiddenimports=[],
+             # The algorithm modules are imported lazily by name, so the analysis does not see them or their imports
+             hiddenimports=['algorithms.algorithms', 'algorithms.mcts', 'algorithms.MCTSNode', 'algorithms.symmetry',
+                            'algorithms.endgame', 'algorithms.policy', 'statistics', 'numpy', 'importlib.util'],
              hookspath=[],
              runtime_hooks=[],
              excludes=[],
@@ -55,6 +55,10 @@ def find_all_arithmetic_progressions(k: int, numbers: list[int]) -> list[list[in
                 progs.append(prog)
     return sorted(progs)
 
+def is_valid_config(k: int, x: int, lower: int, bound: int) -> bool:
+    """Whether a board of `x` numbers in [lower, bound] with a k-term AP can be generated."""
+    return k >= 2 and lower <= bound and k <= x <= bound - lower + 1 and (bound - lower) // (k - 1) >= 1
+
 def generate_random_subset_with_progression(k, subset_size, lower, bound):
     if subset_size < k or subset_size > (bound - lower + 1):
         raise ValueError("Invalid subset size")
@@ -70,3 +74,66 @@ def generate_random_subset_with_progression(k, subset_size, lower, bound):
     X = list(progression) + additional
     random.shuffle(X)
     return X, sorted(list(progression))
+
+class ProgressionTracker:
+    """
+    Incrementally tracks which arithmetic progressions are still achievable.
+
+    Players are indexed 0 and 1. An AP stays winnable for a player as long as
+    the opponent holds none of its numbers; once no AP is winnable for either
+    player the game can only end in a draw.
+    """
+    def __init__(self, progressions: list[list[int]], first: list[int] = (), second: list[int] = ()):
+        self.progressions = progressions
+        self.index: dict[int, list[int]] = {}
+        for i, prog in enumerate(progressions):
+            for value in prog:
+                self.index.setdefault(value, []).append(i)
+        self.held = ([0] * len(progressions), [0] * len(progressions))
+        self.winnable = [len(progressions), len(progressions)]
+        self.winner = None
+        self.winning_progression = None
+        for value in first:
+            self.place(value, 0)
+        for value in second:
+            self.place(value, 1)
+
+    def copy(self) -> "ProgressionTracker":
+        other = ProgressionTracker.__new__(ProgressionTracker)
+        other.progressions = self.progressions
+        other.index = self.index
+        other.held = (self.held[0][:], self.held[1][:])
+        other.winnable = self.winnable[:]
+        other.winner = self.winner
+        other.winning_progression = self.winning_progression
+        return other
+
+    def place(self, value: int, player: int) -> bool:
+        """Records that `player` took `value`. Returns True if it completed an AP."""
+        held = self.held[player]
+        opponent = 1 - player
+        for i in self.index.get(value, ()):
+            if held[i] == 0:
+                self.winnable[opponent] -= 1
+            held[i] += 1
+            if held[i] == len(self.progressions[i]) and self.winner is None:
+                self.winner = player
+                self.winning_progression = self.progressions[i]
+        return self.winner == player
+
+    def threat(self, value: int, player: int) -> int:
+        """
+        Cheap move prior: the APs through `value` that `player` can still complete
+        or has to block, weighted by how many of their numbers are already taken.
+        """
+        own, other = self.held[player], self.held[1 - player]
+        score = 0
+        for i in self.index.get(value, ()):
+            if other[i] == 0:
+                score += (1 + own[i]) ** 2
+            if own[i] == 0:
+                score += (1 + other[i]) ** 2
+        return score
+
+    def is_draw(self) -> bool:
+        return self.winner is None and self.winnable[0] == 0 and self.winnable[1] == 0